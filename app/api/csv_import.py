@@ -155,33 +155,27 @@ async def save_csv_data(symbol: str, df: pd.DataFrame) -> int:
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        saved_count = 0
-        skipped_count = 0
-        
-        for _, row in df.iterrows():
-            try:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO market_data 
-                    (symbol, timestamp, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    symbol,
-                    row['timestamp'].isoformat(),
-                    float(row['open']),
-                    float(row['high']),
-                    float(row['low']),
-                    float(row['close']),
-                    float(row['volume'])
-                ))
-                
-                if cursor.rowcount > 0:
-                    saved_count += 1
-                else:
-                    skipped_count += 1
-                    
-            except Exception as e:
-                logger.warning(f"行スキップ: {row['timestamp']} - {str(e)}")
-                skipped_count += 1
+        # OHLCが欠損している行は NOT NULL 制約で挿入できないため事前に除外する
+        valid_df = df.dropna(subset=['open', 'high', 'low', 'close'])
+        rows = list(zip(
+            [symbol] * len(valid_df),
+            [timestamp.isoformat() for timestamp in valid_df['timestamp']],
+            valid_df['open'].astype(float).tolist(),
+            valid_df['high'].astype(float).tolist(),
+            valid_df['low'].astype(float).tolist(),
+            valid_df['close'].astype(float).tolist(),
+            valid_df['volume'].astype(float).tolist()
+        ))
+        
+        # 行毎の execute ではなく executemany で一括挿入
+        cursor.executemany("""
+            INSERT OR IGNORE INTO market_data 
+            (symbol, timestamp, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        
+        saved_count = max(cursor.rowcount, 0)
+        skipped_count = len(df) - saved_count
         
         conn.commit()
         conn.close()
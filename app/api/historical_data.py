@@ -210,24 +210,24 @@ async def store_market_data(symbol: str, data: pd.DataFrame) -> int:
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        saved_count = 0
-        for _, row in data.iterrows():
-            cursor.execute("""
-                INSERT OR IGNORE INTO market_data 
-                (symbol, timestamp, open, high, low, close, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                symbol,
-                row['timestamp'],
-                float(row['open']),
-                float(row['high']),
-                float(row['low']),
-                float(row['close']),
-                float(row.get('volume', 0))
-            ))
-            
-            if cursor.rowcount > 0:
-                saved_count += 1
+        volumes = data['volume'].astype(float).tolist() if 'volume' in data.columns else [0.0] * len(data)
+        rows = list(zip(
+            [symbol] * len(data),
+            data['timestamp'].tolist(),
+            data['open'].astype(float).tolist(),
+            data['high'].astype(float).tolist(),
+            data['low'].astype(float).tolist(),
+            data['close'].astype(float).tolist(),
+            volumes
+        ))
+        
+        # 行毎の execute ではなく executemany で一括挿入
+        cursor.executemany("""
+            INSERT OR IGNORE INTO market_data 
+            (symbol, timestamp, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        saved_count = max(cursor.rowcount, 0)
         
         conn.commit()
         conn.close()
@@ -1,12 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Optional
+import orjson
 from datetime import datetime
 from ..models.market_data import (
     MarketDataRequest, OHLCData, Signal, SignalResponse, 
     Trade, SystemStatus
 )
-from ..core.database import db_manager
-from ..core.config import settings
+from ..core.database import db_manager, MARKET_DATA_COLUMNS
+from ..core.config import Settings, get_settings
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -15,16 +17,11 @@ router = APIRouter(prefix="/api/v1", tags=["market_data"])
 @router.post("/market-data")
 async def receive_market_data(request: MarketDataRequest):
     try:
-        for data in request.data:
-            db_manager.insert_market_data(
-                symbol=data.symbol,
-                timestamp=data.timestamp,
-                open_price=data.open,
-                high=data.high,
-                low=data.low,
-                close=data.close,
-                volume=data.volume
-            )
+        # 受信データはまとめて1トランザクションで挿入
+        db_manager.insert_market_data_batch([
+            (data.symbol, data.timestamp, data.open, data.high, data.low, data.close, data.volume)
+            for data in request.data
+        ])
         
         logger.info(f"Received market data for {request.symbol}: {len(request.data)} records")
         return {"status": "success", "records_processed": len(request.data)}
@@ -43,6 +40,18 @@ async def get_market_data(symbol: str, limit: int = 100):
         logger.error(f"Error retrieving market data for {symbol}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving market data: {str(e)}")
 
+@router.get("/market-data/{symbol}/stream")
+async def stream_market_data(symbol: str, limit: Optional[int] = None):
+    """
+    マーケットデータを新しい順にNDJSON（1行1レコード）で逐次取得
+    """
+    return StreamingResponse(_stream_market_data(symbol, limit), media_type="application/x-ndjson")
+
+def _stream_market_data(symbol: str, limit: Optional[int]) -> Iterator[bytes]:
+    """カーソルから読みながら1レコードずつ送出"""
+    for row in db_manager.iter_market_data(symbol, limit):
+        yield orjson.dumps(dict(zip(MARKET_DATA_COLUMNS, row))) + b"\n"
+
 @router.get("/signals", response_model=SignalResponse)
 async def get_signals(symbol: Optional[str] = None):
     try:
@@ -71,7 +80,7 @@ async def get_active_trades():
         raise HTTPException(status_code=500, detail=f"Error retrieving trades: {str(e)}")
 
 @router.get("/system-status", response_model=SystemStatus)
-async def get_system_status():
+async def get_system_status(settings: Settings = Depends(get_settings)):
     try:
         active_trades = db_manager.get_active_trades()
         
@@ -544,6 +544,7 @@ async def save_mt5_historical_data_with_duplicate_check(symbol: str, data_record
             existing_timestamps = {row[0] for row in cursor.fetchall()}
             logger.info(f"既存データ確認: {symbol}で{len(existing_timestamps)}件のタイムスタンプ")
         
+        rows = []
         for record in data_records:
             try:
                 timestamp = record["timestamp"]
@@ -553,11 +554,7 @@ async def save_mt5_historical_data_with_duplicate_check(symbol: str, data_record
                     duplicate_count += 1
                     continue
                 
-                cursor.execute("""
-                    INSERT OR IGNORE INTO market_data 
-                    (symbol, timestamp, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
+                rows.append((
                     symbol,
                     timestamp,
                     float(record["open"]),
@@ -567,16 +564,21 @@ async def save_mt5_historical_data_with_duplicate_check(symbol: str, data_record
                     int(record.get("volume", 0))
                 ))
                 
-                if cursor.rowcount > 0:
-                    saved_count += 1
-                    if check_duplicates:
-                        existing_timestamps.add(timestamp)  # 新しく追加したタイムスタンプを記録
-                else:
-                    duplicate_count += 1
+                if check_duplicates:
+                    existing_timestamps.add(timestamp)  # 同一バッチ内の重複も除外する
                     
             except Exception as e:
                 logger.warning(f"データ保存スキップ: {record.get('timestamp')} - {str(e)}")
         
+        # 行毎の execute ではなく executemany で一括挿入
+        cursor.executemany("""
+            INSERT OR IGNORE INTO market_data 
+            (symbol, timestamp, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        saved_count = max(cursor.rowcount, 0)
+        duplicate_count += len(rows) - saved_count
+        
         conn.commit()
         conn.close()
         
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from ..services.multi_pair_manager import multi_pair_manager
 from ..services.risk_management import risk_manager
@@ -7,7 +9,11 @@ from ..core.database import db_manager
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
-router = APIRouter(prefix="/api/v1", tags=["multi_pair"])
+router = APIRouter(prefix="/api/v1", tags=["multi_pair"], default_response_class=ORJSONResponse)
+
+class ExecuteRecommendationsRequest(BaseModel):
+    # /multi-pair/analysis 等で取得済みの分析結果（指定時は再分析を省略）
+    analysis_result: Optional[Dict[str, Any]] = None
 
 @router.get("/multi-pair/analysis")
 async def get_multi_pair_analysis():
@@ -18,7 +24,7 @@ async def get_multi_pair_analysis():
         logger.info("Starting multi-pair analysis")
         
         # マルチペア分析実行
-        analysis_result = multi_pair_manager.generate_multi_pair_signals()
+        analysis_result = await multi_pair_manager.generate_multi_pair_signals()
         
         if 'error' in analysis_result:
             raise HTTPException(
@@ -42,7 +48,7 @@ async def get_pair_scores():
     """
     try:
         # 全ペア分析
-        all_analysis = multi_pair_manager.analyze_all_pairs()
+        all_analysis = await multi_pair_manager.analyze_all_pairs()
         
         # スコアのみを抽出
         scores = {}
@@ -71,7 +77,7 @@ async def get_trading_recommendations():
     """
     try:
         # マルチペア分析実行
-        analysis_result = multi_pair_manager.generate_multi_pair_signals()
+        analysis_result = await multi_pair_manager.generate_multi_pair_signals()
         
         if 'error' in analysis_result:
             raise HTTPException(status_code=500, detail=analysis_result['error'])
@@ -109,13 +115,20 @@ async def get_correlation_matrix():
         raise HTTPException(status_code=500, detail=f"Correlation matrix error: {str(e)}")
 
 @router.post("/multi-pair/execute-recommendations")
-async def execute_recommendations(background_tasks: BackgroundTasks):
+async def execute_recommendations(
+    background_tasks: BackgroundTasks,
+    request: Optional[ExecuteRecommendationsRequest] = None
+):
     """
     推奨取引の自動実行
+    直前に取得した分析結果がリクエストボディで渡された場合はそれを使用する
     """
     try:
         # 推奨取得
-        analysis_result = multi_pair_manager.generate_multi_pair_signals()
+        if request is not None and request.analysis_result is not None:
+            analysis_result = request.analysis_result
+        else:
+            analysis_result = await multi_pair_manager.generate_multi_pair_signals()
         
         if 'error' in analysis_result:
             raise HTTPException(status_code=500, detail=analysis_result['error'])
@@ -192,7 +205,7 @@ async def compare_pairs(
         comparison_data = {}
         
         for symbol in symbols:
-            if symbol not in multi_pair_manager.currency_pairs:
+            if symbol not in multi_pair_manager.currency_pairs_set:
                 raise HTTPException(status_code=400, detail=f"Unsupported symbol: {symbol}")
             
             # 市場データ取得
@@ -4,18 +4,26 @@
 """
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any, Union
+from typing import Iterator, List, Optional, Dict, Any, Union
 from datetime import datetime
+from itertools import chain
+import asyncio
 import json
 import logging
+import orjson
 
+from app.core import db_pool
 from app.core.database import get_db_connection
-from app.services.optimization_engine import OptimizationEngine
+from app.services.optimization_engine import OptimizationEngine, unpack_history_value
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
+# 最適化履歴をストリーミングする際の1バッチあたりの行数
+HISTORY_STREAM_BATCH_SIZE = 500
+
 class OptimizationRequest(BaseModel):
     name: str
     symbol: str
@@ -59,30 +67,8 @@ async def run_optimization(request: OptimizationRequest, background_tasks: Backg
         if start_date >= end_date:
             raise HTTPException(status_code=400, detail="開始日は終了日より前である必要があります")
         
-        # 最適化ジョブをデータベースに登録
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO optimization_jobs 
-            (name, symbol, start_date, end_date, optimization_type, 
-             objective_function, max_iterations, parameters, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'running', ?)
-        """, (
-            request.name,
-            request.symbol,
-            request.start_date,
-            request.end_date,
-            request.optimization_type,
-            request.objective_function,
-            request.max_iterations,
-            json.dumps(request.parameters),
-            datetime.now()
-        ))
-        
-        optimization_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        # 最適化ジョブをデータベースに登録（イベントループをブロックしないようスレッドで実行）
+        optimization_id = await asyncio.to_thread(_insert_optimization_job, request)
         
         # バックグラウンドで最適化実行
         background_tasks.add_task(
@@ -113,26 +99,9 @@ async def get_optimization_results(
     最適化結果一覧を取得
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM optimization_jobs WHERE 1=1"
-        params = []
-        
-        if symbol:
-            query += " AND symbol = ?"
-            params.append(symbol)
-            
-        if optimization_type:
-            query += " AND optimization_type = ?"
-            params.append(optimization_type)
-        
-        query += " ORDER BY created_at DESC LIMIT ?"
-        params.append(limit)
-        
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        rows = await asyncio.to_thread(
+            _fetch_optimization_jobs, symbol or None, optimization_type or None, limit
+        )
         
         results = []
         for row in rows:
@@ -165,29 +134,16 @@ async def get_optimization_results(
 async def get_optimization_detail(optimization_id: int):
     """
     特定の最適化結果詳細を取得
+    最適化履歴は件数が多くなり得るため、バッチ単位でJSONをストリーミングする
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         # 最適化結果を取得
-        cursor.execute("SELECT * FROM optimization_jobs WHERE id = ?", (optimization_id,))
-        result_row = cursor.fetchone()
+        result_row = await asyncio.to_thread(_fetch_optimization_job, optimization_id)
         
         if not result_row:
             raise HTTPException(status_code=404, detail="最適化結果が見つかりません")
         
-        # 最適化履歴を取得
-        cursor.execute("""
-            SELECT * FROM optimization_history 
-            WHERE optimization_id = ? 
-            ORDER BY iteration
-        """, (optimization_id,))
-        
-        history_rows = cursor.fetchall()
-        conn.close()
-        
-        # 結果を構築
+        # 結果を構築（履歴はストリーミング時に追加）
         result = {
             "id": result_row[0],
             "name": result_row[1],
@@ -203,25 +159,23 @@ async def get_optimization_detail(optimization_id: int):
             "best_score": result_row[11],
             "total_iterations": result_row[12],
             "created_at": result_row[13],
-            "completed_at": result_row[14],
-            "history": []
+            "completed_at": result_row[14]
         }
         
-        # 最適化履歴を追加
-        for history_row in history_rows:
-            history = {
-                "iteration": history_row[2],
-                "parameters": json.loads(history_row[3]),
-                "score": history_row[4],
-                "metrics": json.loads(history_row[5]) if history_row[5] else {}
-            }
-            result["history"].append(history)
-        
-        return result
+        # 履歴のクエリ実行と最初のバッチの読み込みはレスポンス開始前に行い、DBエラーは500として返す
+        history_batches = _iter_optimization_history(optimization_id)
+        first_batch = await asyncio.to_thread(next, history_batches, None)
         
     except Exception as e:
         logger.error(f"最適化詳細取得エラー: {str(e)}")
         raise HTTPException(status_code=500, detail=f"最適化詳細取得に失敗しました: {str(e)}")
+    
+    if first_batch is not None:
+        history_batches = chain((first_batch,), history_batches)
+    return StreamingResponse(
+        _stream_optimization_detail(result, history_batches),
+        media_type="application/json"
+    )
 
 @router.get("/optimization/status/{optimization_id}")
 async def get_optimization_status(optimization_id: int):
@@ -280,21 +234,11 @@ async def delete_optimization_result(optimization_id: int):
     最適化結果を削除
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 最適化履歴を削除
-        cursor.execute("DELETE FROM optimization_history WHERE optimization_id = ?", (optimization_id,))
+        deleted_count = await asyncio.to_thread(_delete_optimization_job, optimization_id)
         
-        # 最適化ジョブを削除
-        cursor.execute("DELETE FROM optimization_jobs WHERE id = ?", (optimization_id,))
-        
-        if cursor.rowcount == 0:
+        if deleted_count == 0:
             raise HTTPException(status_code=404, detail="最適化結果が見つかりません")
         
-        conn.commit()
-        conn.close()
-        
         logger.info(f"最適化結果削除: ID={optimization_id}")
         
         return {
@@ -313,21 +257,11 @@ async def stop_optimization(optimization_id: int):
     実行中の最適化を停止
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE optimization_jobs 
-            SET status = 'stopped', completed_at = ?
-            WHERE id = ? AND status = 'running'
-        """, (datetime.now(), optimization_id))
+        stopped_count = await asyncio.to_thread(_stop_optimization_job, optimization_id)
         
-        if cursor.rowcount == 0:
+        if stopped_count == 0:
             raise HTTPException(status_code=404, detail="実行中の最適化が見つかりません")
         
-        conn.commit()
-        conn.close()
-        
         logger.info(f"最適化停止: ID={optimization_id}")
         
         return {
@@ -340,70 +274,70 @@ async def stop_optimization(optimization_id: int):
         logger.error(f"最適化停止エラー: {str(e)}")
         raise HTTPException(status_code=500, detail=f"最適化停止に失敗しました: {str(e)}")
 
+# 最適化テンプレート（静的データのため、インポート時に一度だけJSONへエンコードしておく）
+_OPTIMIZATION_TEMPLATES = {
+    "dow_elliott_basic": {
+        "name": "ダウ理論・エリオット波動基本",
+        "parameters": {
+            "ma_period": {"min_value": 10, "max_value": 50, "type": "int"},
+            "rsi_period": {"min_value": 10, "max_value": 20, "type": "int"},
+            "bb_period": {"min_value": 15, "max_value": 30, "type": "int"},
+            "bb_std": {"min_value": 1.5, "max_value": 2.5, "type": "float", "step": 0.1},
+            "atr_period": {"min_value": 10, "max_value": 20, "type": "int"},
+            "entry_threshold": {"min_value": 40, "max_value": 70, "type": "int"},
+            "swing_threshold": {"min_value": 0.3, "max_value": 0.8, "type": "float", "step": 0.1},
+            "max_hold_hours": {"min_value": 24, "max_value": 168, "type": "int"}
+        }
+    },
+    "trend_following": {
+        "name": "トレンドフォロー戦略",
+        "parameters": {
+            "fast_ma": {"min_value": 5, "max_value": 20, "type": "int"},
+            "slow_ma": {"min_value": 20, "max_value": 100, "type": "int"},
+            "rsi_oversold": {"min_value": 20, "max_value": 40, "type": "int"},
+            "rsi_overbought": {"min_value": 60, "max_value": 80, "type": "int"},
+            "stop_loss_pct": {"min_value": 1, "max_value": 5, "type": "float", "step": 0.5},
+            "take_profit_pct": {"min_value": 2, "max_value": 10, "type": "float", "step": 0.5}
+        }
+    },
+    "mean_reversion": {
+        "name": "平均回帰戦略",
+        "parameters": {
+            "bb_period": {"min_value": 15, "max_value": 40, "type": "int"},
+            "bb_std": {"min_value": 1.8, "max_value": 2.5, "type": "float", "step": 0.1},
+            "rsi_period": {"min_value": 10, "max_value": 25, "type": "int"},
+            "rsi_lower": {"min_value": 15, "max_value": 35, "type": "int"},
+            "rsi_upper": {"min_value": 65, "max_value": 85, "type": "int"},
+            "hold_time_hours": {"min_value": 4, "max_value": 48, "type": "int"}
+        }
+    }
+}
+
+_OPTIMIZATION_TEMPLATES_PAYLOAD = {
+    "templates": _OPTIMIZATION_TEMPLATES,
+    "objective_functions": [
+        {"value": "sharpe_ratio", "label": "シャープレシオ"},
+        {"value": "total_profit", "label": "総利益"},
+        {"value": "win_rate", "label": "勝率"},
+        {"value": "profit_factor", "label": "プロフィットファクター"},
+        {"value": "max_drawdown", "label": "最大ドローダウン（最小化）"}
+    ],
+    "optimization_types": [
+        {"value": "genetic_algorithm", "label": "遺伝的アルゴリズム"},
+        {"value": "grid_search", "label": "グリッドサーチ"},
+        {"value": "random_search", "label": "ランダムサーチ"},
+        {"value": "bayesian_optimization", "label": "ベイズ最適化"}
+    ]
+}
+
+_OPTIMIZATION_TEMPLATES_JSON = orjson.dumps(_OPTIMIZATION_TEMPLATES_PAYLOAD)
+
 @router.get("/optimization/templates")
 async def get_optimization_templates():
     """
     最適化テンプレートを取得
     """
-    try:
-        templates = {
-            "dow_elliott_basic": {
-                "name": "ダウ理論・エリオット波動基本",
-                "parameters": {
-                    "ma_period": {"min_value": 10, "max_value": 50, "type": "int"},
-                    "rsi_period": {"min_value": 10, "max_value": 20, "type": "int"},
-                    "bb_period": {"min_value": 15, "max_value": 30, "type": "int"},
-                    "bb_std": {"min_value": 1.5, "max_value": 2.5, "type": "float", "step": 0.1},
-                    "atr_period": {"min_value": 10, "max_value": 20, "type": "int"},
-                    "entry_threshold": {"min_value": 40, "max_value": 70, "type": "int"},
-                    "swing_threshold": {"min_value": 0.3, "max_value": 0.8, "type": "float", "step": 0.1},
-                    "max_hold_hours": {"min_value": 24, "max_value": 168, "type": "int"}
-                }
-            },
-            "trend_following": {
-                "name": "トレンドフォロー戦略",
-                "parameters": {
-                    "fast_ma": {"min_value": 5, "max_value": 20, "type": "int"},
-                    "slow_ma": {"min_value": 20, "max_value": 100, "type": "int"},
-                    "rsi_oversold": {"min_value": 20, "max_value": 40, "type": "int"},
-                    "rsi_overbought": {"min_value": 60, "max_value": 80, "type": "int"},
-                    "stop_loss_pct": {"min_value": 1, "max_value": 5, "type": "float", "step": 0.5},
-                    "take_profit_pct": {"min_value": 2, "max_value": 10, "type": "float", "step": 0.5}
-                }
-            },
-            "mean_reversion": {
-                "name": "平均回帰戦略",
-                "parameters": {
-                    "bb_period": {"min_value": 15, "max_value": 40, "type": "int"},
-                    "bb_std": {"min_value": 1.8, "max_value": 2.5, "type": "float", "step": 0.1},
-                    "rsi_period": {"min_value": 10, "max_value": 25, "type": "int"},
-                    "rsi_lower": {"min_value": 15, "max_value": 35, "type": "int"},
-                    "rsi_upper": {"min_value": 65, "max_value": 85, "type": "int"},
-                    "hold_time_hours": {"min_value": 4, "max_value": 48, "type": "int"}
-                }
-            }
-        }
-        
-        return {
-            "templates": templates,
-            "objective_functions": [
-                {"value": "sharpe_ratio", "label": "シャープレシオ"},
-                {"value": "total_profit", "label": "総利益"},
-                {"value": "win_rate", "label": "勝率"},
-                {"value": "profit_factor", "label": "プロフィットファクター"},
-                {"value": "max_drawdown", "label": "最大ドローダウン（最小化）"}
-            ],
-            "optimization_types": [
-                {"value": "genetic_algorithm", "label": "遺伝的アルゴリズム"},
-                {"value": "grid_search", "label": "グリッドサーチ"},
-                {"value": "random_search", "label": "ランダムサーチ"},
-                {"value": "bayesian_optimization", "label": "ベイズ最適化"}
-            ]
-        }
-        
-    except Exception as e:
-        logger.error(f"最適化テンプレート取得エラー: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"最適化テンプレート取得に失敗しました: {str(e)}")
+    return Response(content=_OPTIMIZATION_TEMPLATES_JSON, media_type="application/json")
 
 # バックグラウンド処理関数
 async def execute_optimization(optimization_id: int, request: OptimizationRequest):
@@ -438,7 +372,138 @@ async def execute_optimization(optimization_id: int, request: OptimizationReques
         logger.error(f"最適化実行エラー: {str(e)}")
         
         # エラー情報をデータベースに記録
-        conn = get_db_connection()
+        await asyncio.to_thread(_mark_optimization_error, optimization_id)
+
+async def save_optimization_result(optimization_id: int, result: Dict[str, Any]):
+    """
+    最適化結果をデータベースに保存
+    """
+    try:
+        await asyncio.to_thread(_save_optimization_result_sync, optimization_id, result)
+        
+    except Exception as e:
+        logger.error(f"最適化結果保存エラー: {str(e)}")
+
+# 同期DB処理（asyncio.to_thread 経由でワーカースレッド上で実行）
+def _fetch_optimization_jobs(symbol: Optional[str], optimization_type: Optional[str], limit: int):
+    """
+    最適化ジョブ一覧を取得
+    フィルタの有無に関わらず同一のSQL文を使い、接続のステートメントキャッシュを再利用する
+    """
+    with db_pool.acquire() as conn:
+        cursor = conn.execute("""
+            SELECT * FROM optimization_jobs 
+            WHERE (? IS NULL OR symbol = ?) 
+              AND (? IS NULL OR optimization_type = ?) 
+            ORDER BY created_at DESC LIMIT ?
+        """, (symbol, symbol, optimization_type, optimization_type, limit))
+        return cursor.fetchall()
+
+def _fetch_optimization_job(optimization_id: int):
+    """最適化ジョブの行を取得"""
+    with db_pool.acquire() as conn:
+        cursor = conn.execute("SELECT * FROM optimization_jobs WHERE id = ?", (optimization_id,))
+        return cursor.fetchone()
+
+def _iter_optimization_history(optimization_id: int) -> Iterator[List[tuple]]:
+    """最適化履歴を fetchmany でバッチ単位に読み込む"""
+    with db_pool.acquire() as conn:
+        cursor = conn.execute("""
+            SELECT iteration, parameters, score, metrics FROM optimization_history 
+            WHERE optimization_id = ? 
+            ORDER BY iteration
+        """, (optimization_id,))
+        
+        while True:
+            history_rows = cursor.fetchmany(HISTORY_STREAM_BATCH_SIZE)
+            if not history_rows:
+                break
+            yield history_rows
+
+def _stream_optimization_detail(result: Dict[str, Any], history_batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    """
+    最適化結果詳細のJSONを分割して生成
+    履歴はバッチ毎に行ごとにエンコードして逐次送出する
+    （送出開始後のエラーはステータスを変更できないため、ログに記録して打ち切る）
+    """
+    # 結果本体の閉じ括弧を外して history 配列を開く
+    yield orjson.dumps(result)[:-1] + b',"history":['
+    
+    separator = b''
+    try:
+        for history_rows in history_batches:
+            yield separator + b','.join(
+                orjson.dumps({
+                    "iteration": history_row[0],
+                    "parameters": unpack_history_value(history_row[1]),
+                    "score": history_row[2],
+                    "metrics": unpack_history_value(history_row[3]) or {}
+                })
+                for history_row in history_rows
+            )
+            separator = b','
+    except Exception as e:
+        logger.error(f"最適化履歴送出エラー: {str(e)}")
+        raise
+    
+    yield b']}'
+
+def _insert_optimization_job(request: OptimizationRequest) -> int:
+    """最適化ジョブを登録し、IDを返す"""
+    with db_pool.acquire() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO optimization_jobs 
+            (name, symbol, start_date, end_date, optimization_type, 
+             objective_function, max_iterations, parameters, status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'running', ?)
+        """, (
+            request.name,
+            request.symbol,
+            request.start_date,
+            request.end_date,
+            request.optimization_type,
+            request.objective_function,
+            request.max_iterations,
+            json.dumps(request.parameters),
+            datetime.now()
+        ))
+        conn.commit()
+        return cursor.lastrowid
+
+def _delete_optimization_job(optimization_id: int) -> int:
+    """最適化ジョブと履歴を削除し、削除したジョブ件数を返す"""
+    with db_pool.acquire() as conn:
+        cursor = conn.cursor()
+        
+        # 最適化履歴を削除
+        cursor.execute("DELETE FROM optimization_history WHERE optimization_id = ?", (optimization_id,))
+        
+        # 最適化ジョブを削除
+        cursor.execute("DELETE FROM optimization_jobs WHERE id = ?", (optimization_id,))
+        deleted_count = cursor.rowcount
+        
+        if deleted_count == 0:
+            conn.rollback()
+        else:
+            conn.commit()
+        return deleted_count
+
+def _stop_optimization_job(optimization_id: int) -> int:
+    """実行中の最適化ジョブを停止状態にし、更新件数を返す"""
+    with db_pool.acquire() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE optimization_jobs 
+            SET status = 'stopped', completed_at = ?
+            WHERE id = ? AND status = 'running'
+        """, (datetime.now(), optimization_id))
+        conn.commit()
+        return cursor.rowcount
+
+def _mark_optimization_error(optimization_id: int):
+    """最適化ジョブをエラー状態にする"""
+    with db_pool.acquire() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE optimization_jobs 
@@ -446,14 +511,10 @@ async def execute_optimization(optimization_id: int, request: OptimizationReques
             WHERE id = ?
         """, (datetime.now(), optimization_id))
         conn.commit()
-        conn.close()
 
-async def save_optimization_result(optimization_id: int, result: Dict[str, Any]):
-    """
-    最適化結果をデータベースに保存
-    """
-    try:
-        conn = get_db_connection()
+def _save_optimization_result_sync(optimization_id: int, result: Dict[str, Any]):
+    """最適化結果でジョブを完了状態に更新"""
+    with db_pool.acquire() as conn:
         cursor = conn.cursor()
         
         # メイン結果を更新
@@ -469,9 +530,4 @@ async def save_optimization_result(optimization_id: int, result: Dict[str, Any])
             datetime.now(),
             optimization_id
         ))
-        
-        conn.commit()
-        conn.close()
-        
-    except Exception as e:
-        logger.error(f"最適化結果保存エラー: {str(e)}")
\ No newline at end of file
+        conn.commit()
\ No newline at end of file
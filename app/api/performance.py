@@ -4,24 +4,50 @@
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional, Dict, Any
+from fastapi.responses import ORJSONResponse
+from typing import Awaitable, Callable, Hashable, List, Optional, Dict, Any
 from datetime import datetime, timedelta
 import logging
 
+from app.core.cache import TTLCache
 from app.core.database import get_db_connection
 from app.services.performance_monitor import PerformanceMonitor
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
+# 全エンドポイントで共有するモニターインスタンス
+performance_monitor = PerformanceMonitor()
+
+# 集計系エンドポイントのレスポンスキャッシュ（TTL: 秒）
+DASHBOARD_CACHE_TTL = 60
+ANALYSIS_CACHE_TTL = 300
+MONTHLY_SUMMARY_CACHE_TTL = 3600
+_response_cache = TTLCache(default_ttl=DASHBOARD_CACHE_TTL)
+
+async def _cached(key: Hashable, ttl: float, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    キャッシュ済みの結果があれば返し、なければ計算してキャッシュする
+    エラー結果はキャッシュしない
+    """
+    cached = _response_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    result = await compute()
+    if not (isinstance(result, dict) and "error" in result):
+        _response_cache.set(key, result, ttl)
+    return result
+
 @router.get("/performance/dashboard")
 async def get_performance_dashboard():
     """
     パフォーマンスダッシュボードの総合情報を取得
     """
     try:
-        monitor = PerformanceMonitor()
-        dashboard_data = await monitor.get_dashboard_data()
+        dashboard_data = await _cached(
+            ("dashboard",), DASHBOARD_CACHE_TTL, performance_monitor.get_dashboard_data
+        )
         
         return dashboard_data
         
@@ -38,8 +64,7 @@ async def get_trading_metrics(
     取引パフォーマンス指標を取得
     """
     try:
-        monitor = PerformanceMonitor()
-        metrics = await monitor.get_trading_metrics(period_days, symbol)
+        metrics = await performance_monitor.get_trading_metrics(period_days, symbol)
         
         return metrics
         
@@ -53,8 +78,7 @@ async def get_system_metrics():
     システムパフォーマンス指標を取得
     """
     try:
-        monitor = PerformanceMonitor()
-        metrics = await monitor.get_system_metrics()
+        metrics = await performance_monitor.get_system_metrics()
         
         return metrics
         
@@ -71,8 +95,7 @@ async def get_equity_curve(
     エクイティカーブを取得
     """
     try:
-        monitor = PerformanceMonitor()
-        equity_curve = await monitor.get_equity_curve(period_days, interval)
+        equity_curve = await performance_monitor.get_equity_curve(period_days, interval)
         
         return equity_curve
         
@@ -88,8 +111,7 @@ async def get_drawdown_analysis(
     ドローダウン分析を取得
     """
     try:
-        monitor = PerformanceMonitor()
-        analysis = await monitor.get_drawdown_analysis(period_days)
+        analysis = await performance_monitor.get_drawdown_analysis(period_days)
         
         return analysis
         
@@ -105,8 +127,7 @@ async def get_risk_metrics(
     リスク指標を取得
     """
     try:
-        monitor = PerformanceMonitor()
-        metrics = await monitor.get_risk_metrics(period_days)
+        metrics = await performance_monitor.get_risk_metrics(period_days)
         
         return metrics
         
@@ -122,8 +143,10 @@ async def get_symbol_analysis(
     通貨ペア別分析を取得
     """
     try:
-        monitor = PerformanceMonitor()
-        analysis = await monitor.get_symbol_analysis(period_days)
+        analysis = await _cached(
+            ("symbol_analysis", period_days), ANALYSIS_CACHE_TTL,
+            lambda: performance_monitor.get_symbol_analysis(period_days)
+        )
         
         return analysis
         
@@ -139,8 +162,7 @@ async def get_time_analysis(
     時間帯別分析を取得
     """
     try:
-        monitor = PerformanceMonitor()
-        analysis = await monitor.get_time_analysis(period_days)
+        analysis = await performance_monitor.get_time_analysis(period_days)
         
         return analysis
         
@@ -156,8 +178,7 @@ async def get_signal_analysis(
     シグナル分析を取得
     """
     try:
-        monitor = PerformanceMonitor()
-        analysis = await monitor.get_signal_analysis(period_days)
+        analysis = await performance_monitor.get_signal_analysis(period_days)
         
         return analysis
         
@@ -173,8 +194,10 @@ async def get_correlation_analysis(
     相関分析を取得
     """
     try:
-        monitor = PerformanceMonitor()
-        analysis = await monitor.get_correlation_analysis(period_days)
+        analysis = await _cached(
+            ("correlation_analysis", period_days), ANALYSIS_CACHE_TTL,
+            lambda: performance_monitor.get_correlation_analysis(period_days)
+        )
         
         return analysis
         
@@ -190,8 +213,10 @@ async def get_monthly_summary(
     月次サマリーを取得
     """
     try:
-        monitor = PerformanceMonitor()
-        summary = await monitor.get_monthly_summary(months)
+        summary = await _cached(
+            ("monthly_summary", months), MONTHLY_SUMMARY_CACHE_TTL,
+            lambda: performance_monitor.get_monthly_summary(months)
+        )
         
         return summary
         
@@ -206,8 +231,7 @@ async def get_live_metrics():
     リアルタイムパフォーマンス指標を取得
     """
     try:
-        monitor = PerformanceMonitor()
-        metrics = await monitor.get_live_metrics()
+        metrics = await performance_monitor.get_live_metrics()
         
         return metrics
         
@@ -224,8 +248,10 @@ async def get_benchmark_comparison(
     ベンチマーク比較を取得
     """
     try:
-        monitor = PerformanceMonitor()
-        comparison = await monitor.get_benchmark_comparison(period_days, benchmark)
+        comparison = await _cached(
+            ("benchmark_comparison", period_days, benchmark), ANALYSIS_CACHE_TTL,
+            lambda: performance_monitor.get_benchmark_comparison(period_days, benchmark)
+        )
         
         return comparison
         
@@ -242,8 +268,7 @@ async def generate_performance_report(
     パフォーマンスレポートを生成
     """
     try:
-        monitor = PerformanceMonitor()
-        report = await monitor.generate_performance_report(period_days, report_type)
+        report = await performance_monitor.generate_performance_report(period_days, report_type)
         
         return {
             "report_id": report["id"],
@@ -262,8 +287,7 @@ async def get_alerts_summary():
     アラート要約を取得
     """
     try:
-        monitor = PerformanceMonitor()
-        summary = await monitor.get_alerts_summary()
+        summary = await performance_monitor.get_alerts_summary()
         
         return summary
         
@@ -1,11 +1,17 @@
 from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import asyncio
+import numpy as np
+import orjson
+from itertools import chain
+from operator import itemgetter
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
 from ..core.database import db_manager
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
-router = APIRouter(prefix="/api/v1", tags=["reports"])
+router = APIRouter(prefix="/api/v1", tags=["reports"], default_response_class=ORJSONResponse)
 
 @router.get("/trading-summary")
 async def get_trading_summary(days: int = Query(default=30, ge=1, le=365)):
@@ -13,7 +19,7 @@ async def get_trading_summary(days: int = Query(default=30, ge=1, le=365)):
     取引サマリー取得
     """
     try:
-        summary = db_manager.get_trading_summary(days)
+        summary = await asyncio.to_thread(db_manager.get_trading_summary, days)
         
         # 空の場合はデフォルト値を設定
         if not summary or summary.get('total_trades', 0) == 0:
@@ -25,28 +31,11 @@ async def get_trading_summary(days: int = Query(default=30, ge=1, le=365)):
                 'avg_profit': 0.0,
                 'max_profit': 0.0,
                 'max_loss': 0.0,
-                'win_rate': 0.0
+                'win_rate': 0.0,
+                'profit_factor': 0.0,
+                'risk_reward_ratio': 0.0
             }
         
-        # 追加指標の計算
-        if summary['winning_trades'] > 0 and summary['losing_trades'] > 0:
-            # プロフィットファクター計算
-            total_wins = summary.get('total_profit', 0) if summary.get('total_profit', 0) > 0 else 0
-            total_losses = abs(summary.get('max_loss', 0)) * summary.get('losing_trades', 0)
-            
-            if total_losses > 0:
-                summary['profit_factor'] = total_wins / total_losses
-            else:
-                summary['profit_factor'] = 0.0
-        else:
-            summary['profit_factor'] = 0.0
-        
-        # リスクリワード比率
-        if summary.get('max_loss', 0) != 0:
-            summary['risk_reward_ratio'] = abs(summary.get('max_profit', 0) / summary.get('max_loss', 1))
-        else:
-            summary['risk_reward_ratio'] = 0.0
-        
         return {
             'period_days': days,
             'summary': summary,
@@ -67,18 +56,13 @@ async def get_trade_history(
     取引履歴取得
     """
     try:
-        if status:
-            trades = db_manager.get_trades_by_status(status)
-        else:
-            # 全ての取引を取得（簡易実装）
-            trades = db_manager.get_trades_by_status('open') + db_manager.get_trades_by_status('closed')
-        
-        # シンボルフィルター
-        if symbol:
-            trades = [trade for trade in trades if trade.get('symbol') == symbol]
-        
-        # 制限適用
-        trades = trades[:limit]
+        # ステータス・シンボル・件数の絞り込みはSQL側で実施
+        trades = await asyncio.to_thread(
+            db_manager.get_trades,
+            statuses=[status] if status else None,
+            symbol=symbol or None,
+            limit=limit
+        )
         
         return {
             'trades': trades,
@@ -101,7 +85,7 @@ async def get_performance_metrics(days: int = Query(default=30, ge=1, le=365)):
     パフォーマンス指標取得
     """
     try:
-        summary = db_manager.get_trading_summary(days)
+        summary = await asyncio.to_thread(db_manager.get_trading_summary, days)
         
         if not summary or summary.get('total_trades', 0) == 0:
             return {
@@ -147,7 +131,7 @@ async def get_risk_exposure():
     現在のリスクエクスポージャー取得
     """
     try:
-        active_trades = db_manager.get_active_trades()
+        active_trades = await asyncio.to_thread(db_manager.get_active_trades)
         
         if not active_trades:
             return {
@@ -161,33 +145,30 @@ async def get_risk_exposure():
                 'timestamp': datetime.now().isoformat()
             }
         
-        # エクスポージャー計算
-        total_exposure = 0.0
-        total_lot_size = 0.0
-        symbols = set()
-        
-        position_details = []
-        
-        for trade in active_trades:
-            lot_size = trade.get('quantity', 0.0)
-            entry_price = trade.get('entry_price', 0.0)
-            symbol = trade.get('symbol', '')
-            
-            exposure = lot_size * entry_price * 100000  # 標準ロットサイズ仮定
-            total_exposure += exposure
-            total_lot_size += lot_size
-            symbols.add(symbol)
-            
-            position_details.append({
+        # エクスポージャーを列単位で一括計算
+        lot_sizes = np.fromiter((trade['quantity'] for trade in active_trades), dtype=np.float64, count=len(active_trades))
+        entry_prices = np.fromiter((trade['entry_price'] for trade in active_trades), dtype=np.float64, count=len(active_trades))
+        exposures = lot_sizes * entry_prices * 100000  # 標準ロットサイズ仮定
+        
+        total_exposure = float(exposures.sum())
+        total_lot_size = float(lot_sizes.sum())
+        symbols = set(map(itemgetter('symbol'), active_trades))
+        
+        position_details = [
+            {
                 'id': trade.get('id'),
-                'symbol': symbol,
+                'symbol': trade['symbol'],
                 'side': trade.get('side'),
                 'lot_size': lot_size,
                 'entry_price': entry_price,
                 'exposure': exposure,
                 'stop_loss': trade.get('stop_loss'),
                 'take_profit': trade.get('take_profit')
-            })
+            }
+            for trade, lot_size, entry_price, exposure in zip(
+                active_trades, lot_sizes.tolist(), entry_prices.tolist(), exposures.tolist()
+            )
+        ]
         
         return {
             'total_exposure': total_exposure,
@@ -212,44 +193,39 @@ async def get_daily_pnl(days: int = Query(default=30, ge=1, le=365)):
     try:
         start_date = datetime.now() - timedelta(days=days)
         
-        # 簡易実装：取引履歴から日次損益を計算
-        closed_trades = db_manager.get_trades_by_status('closed')
-        
-        # 日付別の損益を集計
-        daily_pnl = {}
-        
-        for trade in closed_trades:
-            exit_time = trade.get('exit_time')
-            if not exit_time:
-                continue
-                
-            try:
-                trade_date = datetime.fromisoformat(exit_time).date()
-                if trade_date >= start_date.date():
-                    date_str = trade_date.isoformat()
-                    if date_str not in daily_pnl:
-                        daily_pnl[date_str] = 0.0
-                    daily_pnl[date_str] += trade.get('profit_loss', 0.0)
-            except ValueError:
-                continue
-        
-        # 日付順でソート
-        sorted_pnl = sorted(daily_pnl.items())
-        
-        return {
-            'period_days': days,
-            'daily_pnl': [
-                {
-                    'date': date,
-                    'pnl': pnl,
-                    'cumulative_pnl': sum(item[1] for item in sorted_pnl[:i+1])
-                }
-                for i, (date, pnl) in enumerate(sorted_pnl)
-            ],
-            'total_pnl': sum(daily_pnl.values()),
-            'timestamp': datetime.now().isoformat()
-        }
+        # クエリの実行と最初の行の取得はレスポンス開始前に行い、DBエラーは500として返す
+        rows = db_manager.iter_daily_pnl(start_date.date().isoformat())
+        first_row = next(rows, None)
         
     except Exception as e:
         logger.error(f"Error getting daily PnL: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get daily PnL: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to get daily PnL: {str(e)}")
+    
+    if first_row is not None:
+        rows = chain((first_row,), rows)
+    return StreamingResponse(_stream_daily_pnl(days, rows), media_type="application/json")
+
+def _stream_daily_pnl(days: int, rows: Iterator[Tuple[str, float]]) -> Iterator[bytes]:
+    """
+    日次損益のJSONを分割して生成
+    SQLで日付別に集計した行をカーソルから読みながら累積損益を付けて逐次送出する
+    （送出開始後のエラーはステータスを変更できないため、ログに記録して打ち切る）
+    """
+    yield b'{"period_days":' + orjson.dumps(days) + b',"daily_pnl":['
+    
+    total_pnl = 0.0
+    separator = b''
+    try:
+        for date, pnl in rows:
+            total_pnl += pnl
+            yield separator + orjson.dumps({
+                'date': date,
+                'pnl': pnl,
+                'cumulative_pnl': total_pnl
+            })
+            separator = b','
+    except Exception as e:
+        logger.error(f"Error streaming daily PnL: {str(e)}")
+        raise
+    
+    yield b'],"total_pnl":' + orjson.dumps(total_pnl) + b',"timestamp":' + orjson.dumps(datetime.now().isoformat()) + b'}'
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, Response
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+import orjson
 from ..services.signal_orchestrator import (
     signal_orchestrator, TradingSignal, SignalType, SignalSource, SignalPriority
 )
@@ -8,7 +10,21 @@ from ..services.multi_pair_manager import multi_pair_manager
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
-router = APIRouter(prefix="/api/v1", tags=["signals"])
+router = APIRouter(prefix="/api/v1", tags=["signals"], default_response_class=ORJSONResponse)
+
+# レスポンス末尾に付与する timestamp フィールドの接頭辞
+_TIMESTAMP_PREFIX = b',"timestamp":'
+
+def _json_response_with_timestamp(payload: Dict[str, Any]) -> Response:
+    """
+    payload に現在時刻の timestamp を付けたJSONレスポンスを生成
+    エンコード済みのバイト列に定数の接頭辞と時刻を連結し、dictの再構築や isoformat() を省く
+    """
+    return Response(
+        content=orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)[:-1]
+        + _TIMESTAMP_PREFIX + orjson.dumps(datetime.now()) + b'}',
+        media_type="application/json"
+    )
 
 @router.get("/signals/active")
 async def get_active_signals():
@@ -19,13 +35,13 @@ async def get_active_signals():
         active_signals = signal_orchestrator.active_signals
         prioritized_signals = signal_orchestrator.get_prioritized_signals()
         
-        return {
+        # 優先シグナルはアクティブシグナルの部分集合のため、IDのみ返す
+        return _json_response_with_timestamp({
             'active_signals': [signal.to_dict() for signal in active_signals],
-            'prioritized_signals': [signal.to_dict() for signal in prioritized_signals],
+            'prioritized_ids': [signal.signal_id for signal in prioritized_signals],
             'total_active': len(active_signals),
-            'qualified_count': len(prioritized_signals),
-            'timestamp': datetime.now().isoformat()
-        }
+            'qualified_count': len(prioritized_signals)
+        })
         
     except Exception as e:
         logger.error(f"Error getting active signals: {str(e)}")
@@ -38,7 +54,7 @@ async def generate_signals(background_tasks: BackgroundTasks):
     """
     try:
         # マルチペア分析実行
-        multi_pair_result = multi_pair_manager.generate_multi_pair_signals()
+        multi_pair_result = await multi_pair_manager.generate_multi_pair_signals()
         
         if 'error' in multi_pair_result:
             raise HTTPException(status_code=500, detail=multi_pair_result['error'])
@@ -110,12 +126,13 @@ async def process_signals(background_tasks: BackgroundTasks):
         background_tasks.add_task(execute_signal_processing)
         
         # 現在のシグナル状況を返す
-        prioritized_signals = signal_orchestrator.get_prioritized_signals()
+        scored_signals = signal_orchestrator.score_qualified_signals()
+        top_signals = signal_orchestrator.get_top_k_signals(5, scored_signals)
         
         return {
             'message': 'Signal processing started in background',
-            'signals_to_process': len(prioritized_signals),
-            'processing_queue': [signal.to_dict() for signal in prioritized_signals[:5]],  # 上位5件
+            'signals_to_process': len(scored_signals),
+            'processing_queue': [signal.to_dict() for signal in top_signals],  # 上位5件
             'timestamp': datetime.now().isoformat()
         }
         
@@ -287,15 +304,12 @@ async def check_signal_health():
             health_status = "warning"
             issues.append("Signal history growing large")
         
-        # 古いシグナルチェック
-        old_signals = [
-            s for s in signal_orchestrator.active_signals
-            if (datetime.now() - s.timestamp).total_seconds() > 3600  # 1時間以上
-        ]
+        # 古いシグナルチェック（1時間以上）
+        old_signal_count = signal_orchestrator.count_signals_older_than(3600)
         
-        if old_signals:
+        if old_signal_count:
             health_status = "warning"
-            issues.append(f"{len(old_signals)} signals are older than 1 hour")
+            issues.append(f"{old_signal_count} signals are older than 1 hour")
         
         return {
             'status': health_status,
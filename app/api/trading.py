@@ -1,17 +1,21 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
-from datetime import datetime
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Iterator, List, Optional
+import asyncio
+import functools
+import orjson
 from ..models.trading import (
     OrderRequest, OrderResponse, PositionInfo, AccountInfo,
     TradeSignal, ClosePositionRequest, ModifyPositionRequest,
     RiskCalculation
 )
 from ..services.risk_management import risk_manager
+from ..core.clock import now_iso
 from ..core.database import db_manager
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
-router = APIRouter(prefix="/api/v1", tags=["trading"])
+router = APIRouter(prefix="/api/v1", tags=["trading"], default_response_class=ORJSONResponse)
 
 @router.post("/orders", response_model=OrderResponse)
 async def create_order(order: OrderRequest):
@@ -28,7 +32,7 @@ async def create_order(order: OrderRequest):
         }
         
         # 現在のポジション取得
-        current_positions = db_manager.get_active_trades()
+        current_positions = await asyncio.to_thread(db_manager.get_active_trades)
         
         # 取引シグナル形式に変換
         signal = {
@@ -40,8 +44,8 @@ async def create_order(order: OrderRequest):
         }
         
         # リスク検証
-        validation = risk_manager.validate_trade_signal(
-            signal, mock_account, current_positions
+        validation = await asyncio.to_thread(
+            risk_manager.validate_trade_signal, signal, mock_account, current_positions
         )
         
         if not validation['valid']:
@@ -73,34 +77,55 @@ async def get_positions():
     現在のポジション一覧取得
     """
     try:
-        # データベースからアクティブなトレード取得
-        active_trades = db_manager.get_active_trades()
+        # データベースからアクティブなトレード取得（列順は OPEN_POSITION_COLUMNS）
+        rows = await asyncio.to_thread(db_manager.get_open_position_rows)
         
         # MT5から最新のポジション情報取得（シミュレーション）
-        positions = []
-        for trade in active_trades:
-            position = PositionInfo(
-                ticket=trade['id'],
-                symbol=trade['symbol'],
-                side=trade['side'],
-                volume=trade['quantity'],
-                entry_price=trade['entry_price'],
-                current_price=trade['entry_price'],  # 実際にはMT5から現在価格取得
-                stop_loss=trade.get('stop_loss'),
-                take_profit=trade.get('take_profit'),
-                profit=0.0,  # 実際にはMT5から損益計算
-                swap=0.0,
-                comment=f"FX Trading System",
-                open_time=trade['entry_time']
-            )
-            positions.append(position)
+        # 同一通貨ペアのポジションが複数あっても現在価格の問い合わせは通貨ペア毎に1回にまとめる
+        symbols = list({row[1] for row in rows})
+        prices = dict(zip(symbols, await asyncio.gather(
+            *(get_current_price_from_mt5(symbol) for symbol in symbols)
+        )))
+        
+        # DB由来のデータのため PositionInfo による再検証は行わず、辞書のまま orjson でエンコードする
+        positions = [_position_from_row(row, prices[row[1]]) for row in rows]
         
-        return positions
+        return ORJSONResponse(content=positions)
         
     except Exception as e:
         logger.error(f"Error getting positions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get positions: {str(e)}")
 
+@router.get("/positions/stream")
+async def stream_positions():
+    """
+    現在のポジション一覧をNDJSON（1行1ポジション）で逐次取得
+    """
+    return StreamingResponse(_stream_positions(), media_type="application/x-ndjson")
+
+def _stream_positions() -> Iterator[bytes]:
+    """オープン中の取引をカーソルから読みながらポジションに変換して送出"""
+    for row in db_manager.iter_open_position_rows():
+        yield orjson.dumps(_position_from_row(row)) + b"\n"
+
+def _position_from_row(row: tuple, current_price: Optional[float] = None) -> dict:
+    """OPEN_POSITION_COLUMNS 順のタプルを PositionInfo 形式の辞書に変換（現在価格が無い場合はエントリー価格）"""
+    ticket, symbol, side, volume, entry_price, stop_loss, take_profit, open_time = row
+    return {
+        'ticket': ticket,
+        'symbol': symbol,
+        'side': side,
+        'volume': volume,
+        'entry_price': entry_price,
+        'current_price': current_price if current_price is not None else entry_price,
+        'stop_loss': stop_loss,
+        'take_profit': take_profit,
+        'profit': 0.0,  # 実際にはMT5から損益計算
+        'swap': 0.0,
+        'comment': "FX Trading System",
+        'open_time': open_time
+    }
+
 @router.post("/positions/{ticket}/close")
 async def close_position(ticket: int, request: ClosePositionRequest):
     """
@@ -108,10 +133,10 @@ async def close_position(ticket: int, request: ClosePositionRequest):
     """
     try:
         # ポジション存在確認
-        positions = db_manager.get_active_trades()
-        target_position = next((pos for pos in positions if pos['id'] == ticket), None)
+        # 主キーで直接取得し、オープン中のものだけを対象とする
+        target_position = await asyncio.to_thread(db_manager.get_trade_by_id, ticket)
         
-        if not target_position:
+        if not target_position or target_position['status'] != 'open':
             raise HTTPException(status_code=404, detail=f"Position {ticket} not found")
         
         # MT5でポジションクローズ（シミュレーション）
@@ -137,10 +162,10 @@ async def modify_position(ticket: int, request: ModifyPositionRequest):
     """
     try:
         # ポジション存在確認
-        positions = db_manager.get_active_trades()
-        target_position = next((pos for pos in positions if pos['id'] == ticket), None)
+        # 主キーで直接取得し、オープン中のものだけを対象とする
+        target_position = await asyncio.to_thread(db_manager.get_trade_by_id, ticket)
         
-        if not target_position:
+        if not target_position or target_position['status'] != 'open':
             raise HTTPException(status_code=404, detail=f"Position {ticket} not found")
         
         # MT5でポジション修正（シミュレーション）
@@ -232,8 +257,10 @@ async def validate_signal(
             'take_profit': take_profit
         }
         
-        current_positions = db_manager.get_active_trades()
-        validation = risk_manager.validate_trade_signal(signal, mock_account, current_positions)
+        current_positions = await asyncio.to_thread(db_manager.get_active_trades)
+        validation = await asyncio.to_thread(
+            risk_manager.validate_trade_signal, signal, mock_account, current_positions
+        )
         
         return {
             'valid': validation['valid'],
@@ -249,6 +276,19 @@ async def validate_signal(
         raise HTTPException(status_code=500, detail=f"Signal validation failed: {str(e)}")
 
 # MT5連携関数（シミュレーション）
+# ブローカー側の同時接続制限を超えないよう、MT5への同時リクエスト数を制限する
+MT5_MAX_CONCURRENT_REQUESTS = 8
+_mt5_semaphore = asyncio.Semaphore(MT5_MAX_CONCURRENT_REQUESTS)
+
+def _mt5_bounded(func):
+    """MT5呼び出しをセマフォで囲むデコレータ"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        async with _mt5_semaphore:
+            return await func(*args, **kwargs)
+    return wrapper
+
+@_mt5_bounded
 async def send_order_to_mt5(order: OrderRequest, lot_size: float) -> OrderResponse:
     """MT5に注文送信（シミュレーション）"""
     # 実際の実装では、MQL5のEAにHTTPリクエストを送信
@@ -258,9 +298,16 @@ async def send_order_to_mt5(order: OrderRequest, lot_size: float) -> OrderRespon
         order_id=12345,
         ticket=67890,
         entry_price=150.123,  # 実際にはMT5から取得
-        timestamp=datetime.now().isoformat()
+        timestamp=now_iso()
     )
 
+@_mt5_bounded
+async def get_current_price_from_mt5(symbol: str) -> Optional[float]:
+    """MT5から現在価格取得（シミュレーション）"""
+    # 実際の実装では、MQL5のEAに現在価格を問い合わせる
+    return None
+
+@_mt5_bounded
 async def close_position_in_mt5(ticket: int, volume: Optional[float]) -> dict:
     """MT5でポジションクローズ（シミュレーション）"""
     return {
@@ -268,9 +315,10 @@ async def close_position_in_mt5(ticket: int, volume: Optional[float]) -> dict:
         'message': 'Position closed successfully',
         'ticket': ticket,
         'exit_price': 150.456,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now_iso()
     }
 
+@_mt5_bounded
 async def modify_position_in_mt5(ticket: int, request: ModifyPositionRequest) -> dict:
     """MT5でポジション修正（シミュレーション）"""
     return {
@@ -279,7 +327,7 @@ async def modify_position_in_mt5(ticket: int, request: ModifyPositionRequest) ->
         'ticket': ticket,
         'stop_loss': request.stop_loss,
         'take_profit': request.take_profit,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now_iso()
     }
 
 async def save_trade_to_database(order: OrderRequest, result: OrderResponse):
@@ -0,0 +1,58 @@
+"""
+インプロセスTTLキャッシュ
+変化の遅い集計結果などを一定時間メモリ上に保持する
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class TTLCache:
+    """有効期限付きのシンプルなキー・バリューキャッシュ（スレッドセーフ）"""
+
+    def __init__(self, default_ttl: float = 60.0, max_entries: int = 256):
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """有効期限内の値を取得（期限切れ・未登録の場合は default）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """値を登録"""
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._evict(now)
+            self._entries[key] = (now + (ttl if ttl is not None else self.default_ttl), value)
+
+    def invalidate(self, key: Hashable):
+        """指定キーを削除"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """全エントリを削除"""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self, now: float):
+        # 期限切れを削除し、それでも上限を超える場合は最も早く期限切れになるものから削除
+        expired_keys = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired_keys:
+            del self._entries[key]
+        overflow = len(self._entries) - self.max_entries + 1
+        if overflow > 0:
+            oldest_keys = sorted(self._entries, key=lambda key: self._entries[key][0])[:overflow]
+            for key in oldest_keys:
+                del self._entries[key]
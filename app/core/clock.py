@@ -0,0 +1,24 @@
+"""
+タイムスタンプ生成ユーティリティ
+秒単位の日時文字列をキャッシュし、マイクロ秒部分のみを毎回付与する
+"""
+
+import time
+from datetime import datetime
+from typing import Tuple
+
+# (エポック秒, その秒の isoformat 文字列)
+_second_prefix: Tuple[int, str] = (0, datetime.fromtimestamp(0).isoformat())
+
+def now_iso() -> str:
+    """
+    現在時刻（ローカル時刻）をISO 8601形式で取得
+    datetime.now().isoformat() と同じ形式だが、マイクロ秒は常に6桁で出力する
+    """
+    global _second_prefix
+    seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+    cached_seconds, prefix = _second_prefix
+    if seconds != cached_seconds:
+        prefix = datetime.fromtimestamp(seconds).isoformat()
+        _second_prefix = (seconds, prefix)
+    return f"{prefix}.{nanoseconds // 1000:06d}"
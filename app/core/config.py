@@ -1,5 +1,6 @@
-from pydantic_settings import BaseSettings
-from typing import List
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import cached_property, lru_cache
+from typing import FrozenSet, List
 import os
 
 class Settings(BaseSettings):
@@ -27,8 +28,16 @@ class Settings(BaseSettings):
     
     UPDATE_INTERVAL: int = 300  # 5分（秒）
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    @cached_property
+    def currency_pairs_set(self) -> FrozenSet[str]:
+        """通貨ペアの所属判定用セット"""
+        return frozenset(self.CURRENCY_PAIRS)
+    
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """設定を取得（.env の読み込みはプロセス内で1回のみ）"""
+    return Settings()
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
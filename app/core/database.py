@@ -1,351 +1,620 @@
+import atexit
+import multiprocessing
+import queue
 import sqlite3
 import os
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+import threading
+import pandas as pd
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+from .cache import TTLCache
+from .clock import now_iso
 from .config import settings
+from .db_pool import ConnectionPool
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
+# アクティブトレード一覧のキャッシュ有効期間（秒）
+ACTIVE_TRADES_CACHE_TTL = 1.0
+
+# get_latest_market_data で返す market_data の列（created_at は不要）
+MARKET_DATA_COLUMNS = ('id', 'symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# get_active_trades で返す trades の列（決済・損益関連の列はオープン中の取引では未設定のため除外）
+ACTIVE_TRADE_COLUMNS = (
+    'id', 'symbol', 'side', 'entry_price', 'quantity', 'stop_loss', 'take_profit',
+    'status', 'entry_time'
+)
+
+# ポジション一覧で使用する trades の列（get_open_position_rows の列順）
+OPEN_POSITION_COLUMNS = ('id', 'symbol', 'side', 'quantity', 'entry_price', 'stop_loss', 'take_profit', 'entry_time')
+OPEN_POSITION_SQL = f'''
+    SELECT {', '.join(OPEN_POSITION_COLUMNS)} FROM trades 
+    WHERE status = 'open' 
+    ORDER BY entry_time DESC
+'''
+
+# WALファイルを切り詰めるチェックポイントの実行間隔（秒）
+WAL_CHECKPOINT_INTERVAL = 60.0
+
+# system_logs へ1トランザクションでまとめて書き込む最大件数
+SYSTEM_LOG_BATCH_SIZE = 500
+
+# update_trade で更新可能なフィールド（この順序でSET句を組み立てる）
+TRADE_UPDATE_FIELDS = ('exit_price', 'profit_loss', 'status', 'exit_time', 'stop_loss', 'take_profit')
+
+# 書き込み系SQL（接続毎のステートメントキャッシュで同一文字列として再利用される）
+INSERT_MARKET_DATA_SQL = '''
+    INSERT INTO market_data (symbol, timestamp, open, high, low, close, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+INSERT_SIGNAL_SQL = '''
+    INSERT INTO signals (symbol, signal_type, score, entry_price, stop_loss, take_profit, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+INSERT_TRADE_SQL = '''
+    INSERT INTO trades (symbol, side, entry_price, quantity, stop_loss, take_profit, entry_time, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, 'open')
+'''
+INSERT_SYSTEM_LOG_SQL = '''
+    INSERT INTO system_logs (level, message, module)
+    VALUES (?, ?, ?)
+'''
+
+# テーブル・インデックス定義（init_database で1トランザクションにまとめて実行）
+SCHEMA_SQL = '''
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS market_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume REAL DEFAULT 0,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL,
+    signal_type TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    entry_price REAL,
+    stop_loss REAL,
+    take_profit REAL,
+    timestamp TEXT NOT NULL,
+    status TEXT DEFAULT 'pending',
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    entry_price REAL NOT NULL,
+    exit_price REAL,
+    quantity REAL NOT NULL,
+    stop_loss REAL,
+    take_profit REAL,
+    profit_loss REAL DEFAULT 0,
+    profit REAL DEFAULT 0,
+    status TEXT DEFAULT 'open',
+    entry_time TEXT NOT NULL,
+    exit_time TEXT,
+    open_time TEXT,
+    close_time TEXT,
+    ticket INTEGER,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS system_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    level TEXT NOT NULL,
+    message TEXT NOT NULL,
+    module TEXT,
+    timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_market_data_symbol_timestamp
+ON market_data(symbol, timestamp);
+
+CREATE INDEX IF NOT EXISTS idx_signals_symbol_timestamp
+ON signals(symbol, timestamp);
+
+-- 通貨ペアを指定しない期間検索用（監視の受信チェック、シグナル統計）
+CREATE INDEX IF NOT EXISTS idx_market_data_timestamp
+ON market_data(timestamp);
+
+CREATE INDEX IF NOT EXISTS idx_signals_timestamp_type
+ON signals(timestamp, signal_type, score);
+
+CREATE INDEX IF NOT EXISTS idx_trades_status_exit_time
+ON trades(status, exit_time);
+
+CREATE INDEX IF NOT EXISTS idx_trades_status_symbol_entry_time
+ON trades(status, symbol, entry_time);
+
+-- ステータス・期間での検索（オープン中一覧の entry_time 降順は逆順走査）と、
+-- 決済済み取引の期間集計（get_trading_summary）をテーブルを読まずにインデックスのみで行うためのカバリングインデックス
+CREATE INDEX IF NOT EXISTS idx_trades_status_entry_time_pnl
+ON trades(status, entry_time, profit_loss);
+
+-- 上記のインデックスで代替される旧インデックス
+DROP INDEX IF EXISTS idx_trades_symbol_status;
+DROP INDEX IF EXISTS idx_trades_status_entry_time;
+
+-- アラート関連テーブル
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    message TEXT NOT NULL,
+    symbol TEXT,
+    severity INTEGER NOT NULL,
+    status TEXT DEFAULT 'active',
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    acknowledged_at TEXT,
+    resolved_at TEXT,
+    metadata TEXT
+);
+
+CREATE TABLE IF NOT EXISTS alert_rules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    description TEXT,
+    condition TEXT NOT NULL,
+    alert_type TEXT NOT NULL,
+    severity INTEGER NOT NULL,
+    is_active INTEGER DEFAULT 1,
+    cooldown_minutes INTEGER DEFAULT 5,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS alert_statistics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    alert_type TEXT NOT NULL,
+    count INTEGER DEFAULT 0,
+    total_severity INTEGER DEFAULT 0,
+    UNIQUE(date, alert_type)
+);
+
+-- バックテスト関連テーブル
+CREATE TABLE IF NOT EXISTS backtest_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    total_trades INTEGER NOT NULL,
+    winning_trades INTEGER NOT NULL,
+    total_profit REAL NOT NULL,
+    max_drawdown REAL NOT NULL,
+    sharpe_ratio REAL,
+    win_rate REAL NOT NULL,
+    profit_factor REAL,
+    initial_balance REAL DEFAULT 100000,
+    final_balance REAL,
+    leverage REAL DEFAULT 1.0,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS backtest_trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    backtest_id INTEGER NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    entry_time TEXT NOT NULL,
+    exit_time TEXT NOT NULL,
+    entry_price REAL NOT NULL,
+    exit_price REAL NOT NULL,
+    quantity REAL NOT NULL,
+    profit_loss REAL NOT NULL,
+    FOREIGN KEY (backtest_id) REFERENCES backtest_results (id)
+);
+
+-- インデックス追加
+CREATE INDEX IF NOT EXISTS idx_alerts_status_type
+ON alerts(status, type);
+
+CREATE INDEX IF NOT EXISTS idx_backtest_results_symbol
+ON backtest_results(symbol, created_at);
+
+-- 最適化関連テーブル
+CREATE TABLE IF NOT EXISTS optimization_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    optimization_type TEXT NOT NULL,
+    objective_function TEXT NOT NULL,
+    max_iterations INTEGER NOT NULL,
+    parameters TEXT NOT NULL,
+    status TEXT DEFAULT 'running',
+    best_parameters TEXT,
+    best_score REAL,
+    total_iterations INTEGER DEFAULT 0,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    completed_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS optimization_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    optimization_id INTEGER NOT NULL,
+    iteration INTEGER NOT NULL,
+    parameters BLOB NOT NULL,
+    score REAL NOT NULL,
+    metrics BLOB,
+    FOREIGN KEY (optimization_id) REFERENCES optimization_jobs (id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_optimization_jobs_symbol
+ON optimization_jobs(symbol, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_optimization_history_job
+ON optimization_history(optimization_id, iteration);
+
+COMMIT;
+'''
+
+def _fetch_dicts(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    """結果をタプルで受け取り、列名とまとめて辞書に変換（sqlite3.Row を経由しない）"""
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
 class DatabaseManager:
     def __init__(self, db_path: str = "fx_trading.db"):
         self.db_path = db_path
-        self.init_database()
+        self._pool: Optional[ConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        # trades への書き込み時に明示的に破棄する読み取りキャッシュ
+        self._trades_cache = TTLCache(default_ttl=ACTIVE_TRADES_CACHE_TTL, max_entries=8)
+        # update_trade の更新フィールドの組み合わせ毎に組み立て済みのSQL
+        self._update_trade_templates: Dict[Tuple[str, ...], str] = {}
+        # log_system_event はキューに積むだけにし、書き込みはバックグラウンドスレッドで行う
+        self._system_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._system_log_thread: Optional[threading.Thread] = None
+        self._system_log_lock = threading.Lock()
     
-    def init_database(self):
-        os.makedirs(os.path.dirname(self.db_path) if os.path.dirname(self.db_path) else ".", exist_ok=True)
+    def get_pool(self) -> ConnectionPool:
+        """db_path を対象とするコネクションプールを取得（db_path 変更時は作り直す）"""
+        pool = self._pool
+        if pool is None or pool.db_path != self.db_path:
+            with self._pool_lock:
+                if self._pool is None or self._pool.db_path != self.db_path:
+                    if self._pool is not None:
+                        self._pool.close_all()
+                    # スキーマ作成はインポート時ではなく最初に接続する時に行う
+                    new_pool = ConnectionPool(self.db_path)
+                    self._create_schema(new_pool)
+                    self._pool = new_pool
+                    logger.info(f"SQLite connection pool created: {self.db_path}")
+                pool = self._pool
+        return pool
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """プール接続を借り、正常終了時はコミット・例外時はロールバックする"""
+        with self.get_pool().acquire() as conn:
+            with conn:
+                yield conn
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        関連する複数の書き込みを1トランザクション（1回のコミット）にまとめる
+        BEGIN IMMEDIATE で書き込みロックを先に確保し、正常終了時にコミット・例外時にロールバックする
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS market_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    open REAL NOT NULL,
-                    high REAL NOT NULL,
-                    low REAL NOT NULL,
-                    close REAL NOT NULL,
-                    volume REAL DEFAULT 0,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS signals (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    signal_type TEXT NOT NULL,
-                    score INTEGER NOT NULL,
-                    entry_price REAL,
-                    stop_loss REAL,
-                    take_profit REAL,
-                    timestamp TEXT NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS trades (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    side TEXT NOT NULL,
-                    entry_price REAL NOT NULL,
-                    exit_price REAL,
-                    quantity REAL NOT NULL,
-                    stop_loss REAL,
-                    take_profit REAL,
-                    profit_loss REAL DEFAULT 0,
-                    profit REAL DEFAULT 0,
-                    status TEXT DEFAULT 'open',
-                    entry_time TEXT NOT NULL,
-                    exit_time TEXT,
-                    open_time TEXT,
-                    close_time TEXT,
-                    ticket INTEGER,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS system_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    level TEXT NOT NULL,
-                    message TEXT NOT NULL,
-                    module TEXT,
-                    timestamp TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_market_data_symbol_timestamp 
-                ON market_data(symbol, timestamp)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_signals_symbol_timestamp 
-                ON signals(symbol, timestamp)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_trades_symbol_status 
-                ON trades(symbol, status)
-            ''')
-            
-            # アラート関連テーブル
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS alerts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    type TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    message TEXT NOT NULL,
-                    symbol TEXT,
-                    severity INTEGER NOT NULL,
-                    status TEXT DEFAULT 'active',
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    acknowledged_at TEXT,
-                    resolved_at TEXT,
-                    metadata TEXT
-                )
-            ''')
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS alert_rules (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    description TEXT,
-                    condition TEXT NOT NULL,
-                    alert_type TEXT NOT NULL,
-                    severity INTEGER NOT NULL,
-                    is_active INTEGER DEFAULT 1,
-                    cooldown_minutes INTEGER DEFAULT 5,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS alert_statistics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT NOT NULL,
-                    alert_type TEXT NOT NULL,
-                    count INTEGER DEFAULT 0,
-                    total_severity INTEGER DEFAULT 0,
-                    UNIQUE(date, alert_type)
-                )
-            ''')
-            
-            # バックテスト関連テーブル
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS backtest_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    symbol TEXT NOT NULL,
-                    start_date TEXT NOT NULL,
-                    end_date TEXT NOT NULL,
-                    parameters TEXT NOT NULL,
-                    total_trades INTEGER NOT NULL,
-                    winning_trades INTEGER NOT NULL,
-                    total_profit REAL NOT NULL,
-                    max_drawdown REAL NOT NULL,
-                    sharpe_ratio REAL,
-                    win_rate REAL NOT NULL,
-                    profit_factor REAL,
-                    initial_balance REAL DEFAULT 100000,
-                    final_balance REAL,
-                    leverage REAL DEFAULT 1.0,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS backtest_trades (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    backtest_id INTEGER NOT NULL,
-                    symbol TEXT NOT NULL,
-                    side TEXT NOT NULL,
-                    entry_time TEXT NOT NULL,
-                    exit_time TEXT NOT NULL,
-                    entry_price REAL NOT NULL,
-                    exit_price REAL NOT NULL,
-                    quantity REAL NOT NULL,
-                    profit_loss REAL NOT NULL,
-                    FOREIGN KEY (backtest_id) REFERENCES backtest_results (id)
-                )
-            ''')
-            
-            # インデックス追加
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_alerts_status_type 
-                ON alerts(status, type)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_backtest_results_symbol 
-                ON backtest_results(symbol, created_at)
-            ''')
-            
-            # 最適化関連テーブル
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS optimization_jobs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    symbol TEXT NOT NULL,
-                    start_date TEXT NOT NULL,
-                    end_date TEXT NOT NULL,
-                    optimization_type TEXT NOT NULL,
-                    objective_function TEXT NOT NULL,
-                    max_iterations INTEGER NOT NULL,
-                    parameters TEXT NOT NULL,
-                    status TEXT DEFAULT 'running',
-                    best_parameters TEXT,
-                    best_score REAL,
-                    total_iterations INTEGER DEFAULT 0,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    completed_at TEXT
-                )
-            ''')
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS optimization_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    optimization_id INTEGER NOT NULL,
-                    iteration INTEGER NOT NULL,
-                    parameters TEXT NOT NULL,
-                    score REAL NOT NULL,
-                    metrics TEXT,
-                    FOREIGN KEY (optimization_id) REFERENCES optimization_jobs (id)
-                )
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_optimization_jobs_symbol 
-                ON optimization_jobs(symbol, created_at)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_optimization_history_job 
-                ON optimization_history(optimization_id, iteration)
-            ''')
-            
+        使用例:
+            with db_manager.transaction() as conn:
+                conn.execute(INSERT_MARKET_DATA_SQL, (...))
+                conn.execute(INSERT_SIGNAL_SQL, (...))
+        """
+        with self.get_pool().acquire() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
             conn.commit()
-            logger.info("Database initialized successfully")
+        
+        # trades への書き込みが含まれる可能性があるため読み取りキャッシュを破棄
+        self.invalidate_trades_cache()
+    
+    def checkpoint_wal(self, mode: str = "TRUNCATE") -> Tuple[int, int, int]:
+        """
+        WALのチェックポイントを実行（TRUNCATE の場合は -wal ファイルを切り詰める）
+        
+        Returns:
+            Tuple[int, int, int]: (busy, WALのページ数, チェックポイント済みページ数)
+        """
+        with self.get_pool().acquire() as conn:
+            return conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+    
+    def close(self):
+        """
+        未書き込みのシステムイベントを書き出し、WALを切り詰めて接続を閉じる
+        DBファイルはリポジトリで管理しているため、最後にロールバックジャーナルモードへ戻す
+        """
+        self.flush_system_logs()
+        pool = self._pool
+        if pool is None:
+            return
+        try:
+            self.checkpoint_wal()
+        except sqlite3.Error as e:
+            logger.error(f"Error checkpointing WAL: {str(e)}")
+        with self._pool_lock:
+            self._pool = None
+        pool.close_all()
+        
+        # ワーカープロセスは親プロセスと同じDBファイルを使用中のため切り替えない
+        if multiprocessing.parent_process() is not None:
+            return
+        # 他の接続が残っている場合は切り替えられないため、次回の close に任せる
+        try:
+            conn = sqlite3.connect(pool.db_path, timeout=1.0)
+            try:
+                conn.execute("PRAGMA journal_mode=DELETE").fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error restoring rollback journal mode: {str(e)}")
+    
+    def init_database(self):
+        """テーブル・インデックスを作成（通常は最初の接続時に自動で行われる）"""
+        self._create_schema(self.get_pool())
+    
+    def _create_schema(self, pool: ConnectionPool):
+        db_dir = os.path.dirname(pool.db_path)
+        os.makedirs(db_dir if db_dir else ".", exist_ok=True)
+        
+        with pool.acquire() as conn:
+            # executescript は実行前に未コミットのトランザクションをコミットするため、スクリプト内で BEGIN/COMMIT する
+            conn.executescript(SCHEMA_SQL)
+        logger.info("Database initialized successfully")
     
     def insert_market_data(self, symbol: str, timestamp: str, open_price: float, 
                           high: float, low: float, close: float, volume: float = 0):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO market_data (symbol, timestamp, open, high, low, close, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (symbol, timestamp, open_price, high, low, close, volume))
+            cursor.execute(INSERT_MARKET_DATA_SQL, (symbol, timestamp, open_price, high, low, close, volume))
             conn.commit()
     
+    def insert_market_data_batch(self, rows: List[Tuple[str, str, float, float, float, float, float]]) -> int:
+        """
+        マーケットデータを一括挿入（単一トランザクション）
+        
+        Args:
+            rows: (symbol, timestamp, open, high, low, close, volume) のタプルのリスト
+            
+        Returns:
+            int: 挿入件数
+        """
+        if not rows:
+            return 0
+        
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(INSERT_MARKET_DATA_SQL, rows)
+            return cursor.rowcount
+    
     def insert_signal(self, symbol: str, signal_type: str, score: int, 
                      entry_price: Optional[float] = None, stop_loss: Optional[float] = None,
                      take_profit: Optional[float] = None, timestamp: Optional[str] = None):
         if timestamp is None:
-            timestamp = datetime.now().isoformat()
+            timestamp = now_iso()
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO signals (symbol, signal_type, score, entry_price, stop_loss, take_profit, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (symbol, signal_type, score, entry_price, stop_loss, take_profit, timestamp))
+            cursor.execute(INSERT_SIGNAL_SQL, (symbol, signal_type, score, entry_price, stop_loss, take_profit, timestamp))
             conn.commit()
     
     def get_latest_market_data(self, symbol: str, limit: int = 100) -> List[Dict[str, Any]]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        return [dict(zip(MARKET_DATA_COLUMNS, row)) for row in self.iter_market_data(symbol, limit)]
+    
+    def iter_market_data(self, symbol: str, limit: Optional[int] = None,
+                         batch_size: int = 500) -> Iterator[Tuple]:
+        """
+        マーケットデータを新しい順にタプルで逐次取得（全件をメモリに展開しない）
+        列順は MARKET_DATA_COLUMNS の通り
+        """
+        with self._connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM market_data 
+            cursor.execute(f'''
+                SELECT {', '.join(MARKET_DATA_COLUMNS)} FROM market_data 
                 WHERE symbol = ? 
                 ORDER BY timestamp DESC 
                 LIMIT ?
-            ''', (symbol, limit))
-            return [dict(row) for row in cursor.fetchall()]
+            ''', (symbol, limit if limit is not None else -1))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+    
+    def get_latest_market_data_df(self, symbol: str, limit: int = 100) -> pd.DataFrame:
+        """
+        最新のマーケットデータをDataFrameで取得（行毎の dict を作らず列単位で読み込む）
+        並び順は get_latest_market_data と同じ（新しい順）
+        """
+        with self._connection() as conn:
+            return pd.read_sql_query('''
+                SELECT symbol, timestamp, open, high, low, close, volume FROM market_data 
+                WHERE symbol = ? 
+                ORDER BY timestamp DESC 
+                LIMIT ?
+            ''', conn, params=(symbol, limit))
     
     def get_active_trades(self) -> List[Dict[str, Any]]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM trades 
-                WHERE status = 'open' 
-                ORDER BY entry_time DESC
-            ''')
-            return [dict(row) for row in cursor.fetchall()]
+        """オープン中の取引を取得（短時間キャッシュし、trades 更新時に破棄）"""
+        cache_key = ('active_trades', self.db_path)
+        active_trades = self._trades_cache.get(cache_key)
+        
+        if active_trades is None:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT {', '.join(ACTIVE_TRADE_COLUMNS)} FROM trades 
+                    WHERE status = 'open' 
+                    ORDER BY entry_time DESC
+                ''')
+                active_trades = _fetch_dicts(cursor)
+            self._trades_cache.set(cache_key, active_trades)
+        
+        # 呼び出し側での変更がキャッシュに波及しないよう複製して返す
+        return [dict(trade) for trade in active_trades]
+    
+    def invalidate_trades_cache(self):
+        """trades 関連の読み取りキャッシュを破棄"""
+        self._trades_cache.clear()
     
     def insert_trade(self, symbol: str, side: str, entry_price: float, quantity: float,
                     stop_loss: Optional[float] = None, take_profit: Optional[float] = None,
                     entry_time: Optional[str] = None, ticket: Optional[int] = None) -> int:
         """新規取引をデータベースに挿入"""
         if entry_time is None:
-            entry_time = datetime.now().isoformat()
+            entry_time = now_iso()
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO trades (symbol, side, entry_price, quantity, stop_loss, take_profit, entry_time, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, 'open')
-            ''', (symbol, side, entry_price, quantity, stop_loss, take_profit, entry_time))
+            cursor.execute(INSERT_TRADE_SQL, (symbol, side, entry_price, quantity, stop_loss, take_profit, entry_time))
             trade_id = cursor.lastrowid
             conn.commit()
-            return trade_id
+        
+        self.invalidate_trades_cache()
+        return trade_id
+    
+    def insert_trades_batch(self, trades: List[Tuple]) -> List[int]:
+        """
+        新規取引を一括挿入（単一トランザクション）
+        
+        Args:
+            trades: (symbol, side, entry_price, quantity, stop_loss, take_profit, entry_time) のタプルのリスト
+                    entry_time が None の場合は現在時刻
+            
+        Returns:
+            List[int]: 挿入した取引IDのリスト（入力順）
+        """
+        if not trades:
+            return []
+        
+        # executemany は RETURNING の結果を返さないため、1トランザクション内で1件ずつ実行して lastrowid を集める
+        trade_ids = []
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            for symbol, side, entry_price, quantity, stop_loss, take_profit, entry_time in trades:
+                cursor.execute(INSERT_TRADE_SQL, (
+                    symbol, side, entry_price, quantity, stop_loss, take_profit,
+                    entry_time if entry_time is not None else now_iso()
+                ))
+                trade_ids.append(cursor.lastrowid)
+        
+        self.invalidate_trades_cache()
+        return trade_ids
     
     def update_trade(self, trade_id: int, **kwargs):
         """取引情報を更新"""
         if not kwargs:
             return
         
-        # 更新可能なフィールドのリスト
-        allowed_fields = ['exit_price', 'profit_loss', 'status', 'exit_time', 'stop_loss', 'take_profit']
-        
-        set_clause = []
-        values = []
-        
-        for field, value in kwargs.items():
-            if field in allowed_fields:
-                set_clause.append(f"{field} = ?")
-                values.append(value)
-        
-        if not set_clause:
+        # フィールド順を固定し、引数の順序に関わらず同じSQL文字列（ステートメントキャッシュのキー）にする
+        fields = tuple(field for field in TRADE_UPDATE_FIELDS if field in kwargs)
+        if not fields:
             return
         
+        sql = self._update_trade_templates.get(fields)
+        if sql is None:
+            sql = f"UPDATE trades SET {', '.join(f'{field} = ?' for field in fields)} WHERE id = ?"
+            self._update_trade_templates[fields] = sql
+        values = [kwargs[field] for field in fields]
         values.append(trade_id)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(f'''
-                UPDATE trades 
-                SET {', '.join(set_clause)}
-                WHERE id = ?
-            ''', values)
+            cursor.execute(sql, values)
             conn.commit()
+        
+        self.invalidate_trades_cache()
     
     def get_trade_by_id(self, trade_id: int) -> Optional[Dict[str, Any]]:
         """IDで取引を取得"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM trades WHERE id = ?', (trade_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            rows = _fetch_dicts(cursor)
+            return rows[0] if rows else None
     
     def get_trades_by_status(self, status: str) -> List[Dict[str, Any]]:
         """ステータスで取引を取得"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT * FROM trades 
                 WHERE status = ? 
                 ORDER BY entry_time DESC
             ''', (status,))
-            return [dict(row) for row in cursor.fetchall()]
+            return _fetch_dicts(cursor)
+    
+    def get_open_position_rows(self) -> List[Tuple]:
+        """
+        オープン中の取引をタプルで取得（/positions 用の軽量版）
+        列順は OPEN_POSITION_COLUMNS の通り
+        """
+        cache_key = ('open_position_rows', self.db_path)
+        rows = self._trades_cache.get(cache_key)
+        
+        if rows is None:
+            with self._connection() as conn:
+                rows = conn.execute(OPEN_POSITION_SQL).fetchall()
+            self._trades_cache.set(cache_key, rows)
+        
+        # タプルは変更できないためリストのみ複製する
+        return list(rows)
+    
+    def iter_open_position_rows(self, batch_size: int = 500) -> Iterator[Tuple]:
+        """オープン中の取引をタプルで逐次取得（全件をメモリに展開しない）"""
+        with self._connection() as conn:
+            cursor = conn.execute(OPEN_POSITION_SQL)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+    
+    def get_trades(self, statuses: Optional[List[str]] = None, symbol: Optional[str] = None,
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """ステータス・通貨ペアで絞り込んだ取引を取得（statuses 未指定時は全ステータス）"""
+        # 条件は指定されたものだけ付与し、(status, symbol, entry_time) インデックスを使えるようにする
+        conditions = []
+        params: List[Any] = []
+        
+        if statuses:
+            conditions.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        
+        if symbol is not None:
+            conditions.append("symbol = ?")
+            params.append(symbol)
+        
+        query = "SELECT * FROM trades"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        
+        query += " ORDER BY entry_time DESC LIMIT ?"
+        params.append(limit if limit is not None else -1)
+        
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return _fetch_dicts(cursor)
     
     def get_trading_summary(self, days: int = 30) -> Dict[str, Any]:
         """取引サマリーを取得"""
@@ -353,19 +622,24 @@ class DatabaseManager:
         
         start_date = (datetime.now() - timedelta(days=days)).isoformat()
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             
             # 基本統計
             cursor.execute('''
                 SELECT 
                     COUNT(*) as total_trades,
-                    SUM(CASE WHEN profit_loss > 0 THEN 1 ELSE 0 END) as winning_trades,
-                    SUM(CASE WHEN profit_loss < 0 THEN 1 ELSE 0 END) as losing_trades,
+                    SUM(profit_loss > 0) as winning_trades,
+                    SUM(profit_loss < 0) as losing_trades,
                     SUM(profit_loss) as total_profit,
                     AVG(profit_loss) as avg_profit,
                     MAX(profit_loss) as max_profit,
-                    MIN(profit_loss) as max_loss
+                    MIN(profit_loss) as max_loss,
+                    SUM(CASE WHEN profit_loss > 0 THEN profit_loss END)
+                        / NULLIF(SUM(CASE WHEN profit_loss < 0 THEN -profit_loss END), 0) as profit_factor,
+                    ABS(MAX(profit_loss) / NULLIF(MIN(profit_loss), 0)) as risk_reward_ratio,
+                    CAST(SUM(profit_loss > 0) AS REAL)
+                        / NULLIF(COUNT(*), 0) as win_rate
                 FROM trades 
                 WHERE entry_time >= ? AND status = 'closed'
             ''', (start_date,))
@@ -379,7 +653,10 @@ class DatabaseManager:
                     'total_profit': row[3] or 0.0,
                     'avg_profit': row[4] or 0.0,
                     'max_profit': row[5] or 0.0,
-                    'max_loss': row[6] or 0.0
+                    'max_loss': row[6] or 0.0,
+                    'profit_factor': row[7] or 0.0,
+                    'risk_reward_ratio': row[8] or 0.0,
+                    'win_rate': row[9] or 0.0
                 }
             else:
                 summary = {
@@ -389,29 +666,97 @@ class DatabaseManager:
                     'total_profit': 0.0,
                     'avg_profit': 0.0,
                     'max_profit': 0.0,
-                    'max_loss': 0.0
+                    'max_loss': 0.0,
+                    'profit_factor': 0.0,
+                    'risk_reward_ratio': 0.0,
+                    'win_rate': 0.0
                 }
             
-            # 勝率計算
-            if summary.get('total_trades', 0) > 0:
-                summary['win_rate'] = summary['winning_trades'] / summary['total_trades']
-            else:
-                summary['win_rate'] = 0.0
-            
             return summary
     
-    def log_system_event(self, level: str, message: str, module: Optional[str] = None):
-        with sqlite3.connect(self.db_path) as conn:
+    def get_daily_pnl(self, start_date: str, end_date: Optional[str] = None) -> List[Tuple[str, float]]:
+        """決済済み取引の日次損益を取得（日付昇順）"""
+        return list(self.iter_daily_pnl(start_date, end_date))
+    
+    def iter_daily_pnl(self, start_date: str, end_date: Optional[str] = None,
+                       batch_size: int = 500) -> Iterator[Tuple[str, float]]:
+        """決済済み取引の日次損益を日付昇順に逐次取得"""
+        query = '''
+            SELECT date(exit_time) AS trade_date, SUM(profit_loss) AS pnl
+            FROM trades 
+            WHERE status = 'closed' AND exit_time >= ?
+        '''
+        params = [start_date]
+        
+        if end_date is not None:
+            query += " AND exit_time < ?"
+            params.append(end_date)
+        
+        query += '''
+            GROUP BY trade_date
+            HAVING trade_date IS NOT NULL
+            ORDER BY trade_date
+        '''
+        
+        with self._connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO system_logs (level, message, module)
-                VALUES (?, ?, ?)
-            ''', (level, message, module))
-            conn.commit()
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row[0], row[1] or 0.0
+    
+    def log_system_event(self, level: str, message: str, module: Optional[str] = None):
+        """システムイベントを記録（書き込みはバックグラウンドでまとめて行う）"""
+        self._system_log_queue.put((level, message, module))
+        if self._system_log_thread is None:
+            self._start_system_log_writer()
+    
+    def flush_system_logs(self, timeout: float = 5.0) -> bool:
+        """キュー済みのシステムイベントが書き込まれるまで待機"""
+        if self._system_log_thread is None:
+            return True
+        done = threading.Event()
+        self._system_log_queue.put(done)
+        return done.wait(timeout)
+    
+    def _start_system_log_writer(self):
+        with self._system_log_lock:
+            if self._system_log_thread is not None:
+                return
+            thread = threading.Thread(target=self._drain_system_logs, name="system-log-writer", daemon=True)
+            thread.start()
+            self._system_log_thread = thread
+        atexit.register(self.flush_system_logs)
+    
+    def _drain_system_logs(self):
+        while True:
+            batch = [self._system_log_queue.get()]
+            while len(batch) < SYSTEM_LOG_BATCH_SIZE:
+                try:
+                    batch.append(self._system_log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # flush_system_logs の待機イベントは書き込み後に通知する
+            rows = [item for item in batch if not isinstance(item, threading.Event)]
+            try:
+                if rows:
+                    with self._connection() as conn:
+                        conn.executemany(INSERT_SYSTEM_LOG_SQL, rows)
+            except Exception as e:
+                logger.error(f"Error writing system logs: {str(e)}")
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
 
 # グローバルインスタンス
 db_manager = DatabaseManager()
+# 終了時にWALを書き戻し、管理対象のDBファイルをロールバックジャーナルモードに戻す
+atexit.register(db_manager.close)
 
 def get_db_connection():
-    """データベース接続を取得する関数"""
-    return sqlite3.connect(db_manager.db_path)
\ No newline at end of file
+    """データベース接続を取得する関数（プール接続。close() でプールに返却される）"""
+    return db_manager.get_pool().checkout()
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+SQLiteコネクションプール
+接続をプロセス内で使い回し、WAL + synchronous=NORMAL でコミット毎のfsyncを削減する
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+# 接続毎に設定するPRAGMA
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+# 接続毎にキャッシュするプリペアドステートメント数
+STATEMENT_CACHE_SIZE = 256
+
+class PooledConnection(sqlite3.Connection):
+    """
+    プールが管理する接続
+    checkout() で貸し出した接続は close() でプールに返却される（二重の close() は無視）
+    実際の切断はプール側で行う
+    """
+
+    _pool: Optional["ConnectionPool"] = None
+
+    def close(self):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool._release(self)
+
+class ConnectionPool:
+    """スレッド間で共有するSQLite接続のプール"""
+
+    def __init__(self, db_path: str, max_size: int = 8):
+        self.db_path = db_path
+        self.max_size = max_size
+        self._idle_connections: List[PooledConnection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            factory=PooledConnection
+        )
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _take(self) -> PooledConnection:
+        with self._lock:
+            conn = self._idle_connections.pop() if self._idle_connections else None
+        return conn if conn is not None else self._connect()
+
+    def _release(self, conn: PooledConnection):
+        # 未コミットの変更と呼び出し側で変更された row_factory を元に戻してから返却する
+        if conn.in_transaction:
+            conn.rollback()
+        conn.row_factory = None
+        with self._lock:
+            if len(self._idle_connections) < self.max_size:
+                self._idle_connections.append(conn)
+                return
+        sqlite3.Connection.close(conn)
+
+    @contextmanager
+    def acquire(self) -> Iterator[sqlite3.Connection]:
+        """
+        プールから接続を借りる
+        コミットは呼び出し側で行い、未コミットの変更は返却時にロールバックする
+        """
+        conn = self._take()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def checkout(self) -> sqlite3.Connection:
+        """
+        プールから接続を借りる（返却は conn.close()）
+        conn.close() を呼ぶ既存コードをそのまま使えるようにするためのもの
+        """
+        conn = self._take()
+        conn._pool = self
+        return conn
+
+    def close_all(self):
+        """プール内の待機中接続をすべて閉じる"""
+        with self._lock:
+            connections, self._idle_connections = self._idle_connections, []
+        for conn in connections:
+            sqlite3.Connection.close(conn)
+
+def get_pool() -> ConnectionPool:
+    """db_manager と同じDBファイルを対象とするプールを取得"""
+    from .database import db_manager
+    return db_manager.get_pool()
+
+def acquire():
+    """プール接続を取得する（with db_pool.acquire() as conn: の形で使用）"""
+    return get_pool().acquire()
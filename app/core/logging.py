@@ -1,30 +1,105 @@
+import atexit
 import logging
 import logging.handlers
+import multiprocessing
 import os
+import queue
 from datetime import datetime
 from .config import settings
 
-def setup_logging():
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_queue_listener = None
+_handlers: list = []
+
+# ワーカープロセスのログを親プロセスで出力するためのキューとその処理スレッド
+_worker_log_queue = None
+_worker_queue_listener = None
+
+def _create_handlers() -> list:
+    """ファイル・コンソール出力用のハンドラを生成"""
     log_dir = os.path.dirname(settings.LOG_FILE)
     os.makedirs(log_dir, exist_ok=True)
     
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        logging.handlers.RotatingFileHandler(
+            settings.LOG_FILE,
+            maxBytes=10*1024*1024,  # 10MB
+            backupCount=5,
+            encoding='utf-8'
+        ),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+def setup_logging():
+    global _queue_listener, _handlers
+    
+    handlers = _create_handlers()
+    _handlers = handlers
+    
+    # ファイル・コンソール出力はバックグラウンドスレッドでまとめて行い、
+    # リクエスト処理側はキューに積むだけにする
+    if _queue_listener is not None:
+        _queue_listener.stop()
+    log_queue = queue.SimpleQueue()
+    _queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+    atexit.register(_queue_listener.stop)
+    
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    
     logging.basicConfig(
         level=getattr(logging, settings.LOG_LEVEL.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.handlers.RotatingFileHandler(
-                settings.LOG_FILE,
-                maxBytes=10*1024*1024,  # 10MB
-                backupCount=5,
-                encoding='utf-8'
-            ),
-            logging.StreamHandler()
-        ]
+        handlers=[queue_handler]
     )
     
     logger = logging.getLogger("fx_trading")
     logger.info(f"Logging initialized - Level: {settings.LOG_LEVEL}")
     return logger
 
+def get_worker_log_queue():
+    """
+    ワーカープロセスから親プロセスへログを送るプロセス間キューを取得
+    キューの内容は親プロセスのスレッドが setup_logging のハンドラへ出力する
+    （ログファイルへの書き込み・ローテーションは親プロセスだけが行う）
+    setup_logging 前は None を返す
+    """
+    global _worker_log_queue, _worker_queue_listener
+    
+    if not _handlers:
+        return None
+    if _worker_log_queue is None:
+        _worker_log_queue = multiprocessing.get_context('spawn').Queue()
+        _worker_queue_listener = logging.handlers.QueueListener(
+            _worker_log_queue, *_handlers, respect_handler_level=True
+        )
+        _worker_queue_listener.start()
+        atexit.register(_worker_queue_listener.stop)
+    return _worker_log_queue
+
+def setup_worker_logging(log_queue=None):
+    """
+    ProcessPoolExecutor のワーカープロセス用のログ設定（initializer として使用）
+    ログは get_worker_log_queue のキューで親プロセスへ送る
+    キューがない場合（親プロセスでログ未設定）はコンソールにのみ出力する
+    """
+    if log_queue is not None:
+        handler = logging.handlers.QueueHandler(log_queue)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+    else:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    
+    logging.basicConfig(
+        level=getattr(logging, settings.LOG_LEVEL.upper()),
+        handlers=[handler],
+        force=True
+    )
+
 def get_logger(name: str = "fx_trading") -> logging.Logger:
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
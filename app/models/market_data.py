@@ -1,6 +1,5 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
-from datetime import datetime
 
 class OHLCData(BaseModel):
     symbol: str
@@ -11,10 +10,8 @@ class OHLCData(BaseModel):
     close: float
     volume: float = 0.0
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    # 受信後に書き換えることはないため不変にする
+    model_config = ConfigDict(frozen=True)
 
 class MarketDataRequest(BaseModel):
     symbol: str
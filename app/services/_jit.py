@@ -0,0 +1,21 @@
+"""
+Numba JIT デコレータ
+numba がインストールされていない環境では通常のPython関数として動作する
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - numba 未導入環境
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba.njit の代替（何もしないデコレータ）"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+__all__ = ['njit', 'NUMBA_AVAILABLE']
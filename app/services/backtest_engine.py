@@ -3,18 +3,76 @@
 過去データを使用した取引戦略の検証を実行
 """
 
+import asyncio
+import itertools
+import multiprocessing
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 import logging
 
-from app.core.database import get_db_connection
+from app.core.cache import TTLCache
+from app.core.database import get_db_connection, db_manager
+from app.core.logging import setup_worker_logging, get_worker_log_queue
 from app.services.technical_analysis import TechnicalAnalysisService
 from app.services.risk_management import RiskManager
+from app.services.backtest_kernels import (
+    simulate_scalping, rsi_wilder, atr_wilder, bollinger_bands, equity_stats, warmup_kernels, EXIT_REASONS, TRADE_COLUMNS, TRADE_SIDE, TRADE_ENTRY_INDEX, TRADE_EXIT_INDEX,
+    TRADE_ENTRY_PRICE, TRADE_EXIT_PRICE, TRADE_QUANTITY, TRADE_PROFIT_LOSS, TRADE_EXIT_REASON
+)
 
 logger = logging.getLogger(__name__)
 
+# 読み込み済み市場データの保持期間（秒）
+MARKET_DATA_CACHE_TTL = 300
+# 値は (市場データ, スイング戦略のトレンド分析結果 {(バー数, 分析期間): 分析結果})
+# 分析結果は市場データと同じエントリに持たせ、データの破棄・再読み込み時にまとめて破棄する
+_market_data_cache = TTLCache(default_ttl=MARKET_DATA_CACHE_TTL, max_entries=16)
+
+# 読み込んだ市場データの識別番号（同じ取得条件でも再読み込みしたデータは別物として扱う）
+_market_data_versions = itertools.count()
+
+class PositionsSoA:
+    """
+    バックテスト中のポジションを固定長の構造体配列（SoA）で保持するコンテナ
+    active が使用中スロットを表し、決済したスロットは次のエントリーで再利用する
+    """
+    def __init__(self, capacity: int):
+        self.active = np.zeros(capacity, dtype=bool)
+        self.side = np.zeros(capacity, dtype=np.int8)  # 1: buy, -1: sell
+        self.entry_index = np.zeros(capacity, dtype=np.int64)
+        self.entry_price = np.zeros(capacity)
+        self.quantity = np.zeros(capacity)
+        self.stop_loss = np.full(capacity, np.nan)  # 未設定は NaN
+        self.take_profit = np.full(capacity, np.nan)
+        # SL/TP に最初に到達するバーと決済理由（ストップロス更新時のみ再計算する）
+        self.exit_index = np.zeros(capacity, dtype=np.int64)
+        self.exit_reason = np.empty(capacity, dtype=object)
+    
+    def count(self) -> int:
+        """保有中のポジション数"""
+        return int(self.active.sum())
+    
+    def open(self, side: int, entry_index: int, entry_price: float, quantity: float, stop_loss: float, take_profit: float) -> int:
+        """空きスロットにポジションを追加し、そのスロットを返す"""
+        slot = int(np.flatnonzero(~self.active)[0])
+        self.active[slot] = True
+        self.side[slot] = side
+        self.entry_index[slot] = entry_index
+        self.entry_price[slot] = entry_price
+        self.quantity[slot] = quantity
+        self.stop_loss[slot] = stop_loss
+        self.take_profit[slot] = take_profit
+        return slot
+    
+    def open_slots(self) -> np.ndarray:
+        """保有中のスロット（エントリー順）"""
+        slots = np.flatnonzero(self.active)
+        return slots[np.argsort(self.entry_index[slots])]
+
 class BacktestEngine:
     def __init__(self):
         self.technical_service = TechnicalAnalysisService()
@@ -55,39 +113,94 @@ class BacktestEngine:
             logger.error(f"バックテスト実行エラー: {str(e)}")
             raise
     
+    def run_backtests_parallel(self, specs: List[Dict[str, Any]], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        複数のバックテスト（通貨ペア・パラメータの組み合わせ）をプロセス並列で実行
+        
+        Args:
+            specs: run_backtest のキーワード引数の辞書のリスト
+            max_workers: ワーカープロセス数（省略時はCPU数）
+        
+        Returns:
+            List: specs と同じ順序の結果（失敗したものは {'error': ...}）
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(specs)
+        if not specs:
+            return []
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(specs))
+        
+        # ワーカーが同時にJITコンパイルしないよう、先に親プロセスでコンパイルキャッシュを作成する
+        warmup_kernels()
+        # 親プロセスのSQLite接続を fork で引き継がないよう、ワーカーは spawn で起動して自前の接続を開く
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_backtest_worker,
+            initargs=(db_manager.db_path, get_worker_log_queue())
+        ) as executor:
+            futures = {executor.submit(_run_backtest_worker, spec): index for index, spec in enumerate(specs)}
+            for completed, future in enumerate(as_completed(futures), start=1):
+                index = futures[future]
+                results[index] = future.result()
+                logger.info(f"並列バックテスト完了: {completed}/{len(specs)} ({specs[index].get('symbol')})")
+        
+        return results
+    
     async def _get_market_data(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
         """
         指定期間の市場データを取得
+        同じ期間の再実行（パラメータ最適化など）では読み込み済みのデータを再利用する
+        """
+        cache_key = (db_manager.db_path, symbol, start_date, end_date)
+        entry = _market_data_cache.get(cache_key)
+        if entry is None:
+            df = self._load_market_data(symbol, start_date, end_date)
+            # 分析結果のキャッシュで同じ市場データかを識別するため、取得条件と識別番号を持たせる
+            df.attrs['source'] = (cache_key, next(_market_data_versions))
+            entry = (df, {})
+            _market_data_cache.set(cache_key, entry)
+        # 呼び出し側で指標列を追加するためコピーを返す
+        return entry[0].copy()
+    
+    def _load_market_data(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        指定期間の市場データをDBから読み込む
         """
         try:
-            conn = get_db_connection()
+            start_dt = pd.to_datetime(start_date, format='mixed', errors='coerce')
+            end_dt = pd.to_datetime(end_date, format='mixed', errors='coerce')
             
-            # Handle mixed timestamp formats by using a more flexible query
             query = """
                 SELECT timestamp, open, high, low, close, volume
                 FROM market_data
                 WHERE symbol = ?
-                ORDER BY timestamp
             """
+            params = [symbol]
+            if not pd.isna(start_dt) and not pd.isna(end_dt):
+                # 'T' 区切りと空白区切りの時刻が混在するため、日単位の範囲でSQL側を絞り込み
+                # 正確な範囲は読み込み後に判定する
+                query += " AND timestamp >= ? AND timestamp < ?"
+                params += [
+                    start_dt.strftime('%Y-%m-%d'),
+                    (end_dt.normalize() + timedelta(days=1)).strftime('%Y-%m-%d')
+                ]
+            query += " ORDER BY timestamp"
             
-            df = pd.read_sql_query(query, conn, params=(symbol,))
-            conn.close()
+            conn = get_db_connection()
+            try:
+                df = pd.read_sql_query(query, conn, params=params)
+            finally:
+                conn.close()
             
             if df.empty:
                 raise ValueError(f"指定期間のデータが見つかりません: {symbol} ({start_date} - {end_date})")
             
-            # データタイプを調整（混在する形式に対応）
-            df['timestamp'] = pd.to_datetime(df['timestamp'], format='mixed', errors='coerce')
+            df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', errors='coerce')
             df = df.set_index('timestamp')
             
-            # 日付範囲でフィルタリング
-            start_dt = pd.to_datetime(start_date, format='mixed', errors='coerce')
-            end_dt = pd.to_datetime(end_date, format='mixed', errors='coerce')
-            
-            logger.info(f"データフィルタリング前: {len(df)}件")
-            logger.info(f"要求期間: {start_date} - {end_date}")
-            logger.info(f"変換後期間: {start_dt} - {end_dt}")
-            logger.info(f"データ範囲: {df.index.min()} - {df.index.max()}")
+            logger.info(f"要求期間: {start_date} - {end_date} (変換後: {start_dt} - {end_dt})")
+            logger.info(f"データ範囲: {df.index.min()} - {df.index.max()} ({len(df)}件)")
             
             if not pd.isna(start_dt) and not pd.isna(end_dt):
                 df = df[(df.index >= start_dt) & (df.index <= end_dt)]
@@ -100,6 +213,12 @@ class BacktestEngine:
             # 欠損値を削除
             df = df.dropna()
             
+            # 出来高は整数値であれば int32 で保持してキャッシュ上のメモリを抑える
+            # （価格は取引履歴にそのまま出力され、0.05% 単位の判定にも使うため float64 のまま）
+            volume = df['volume'].to_numpy()
+            if len(volume) and np.array_equal(volume, np.floor(volume)) and np.abs(volume).max() < np.iinfo(np.int32).max:
+                df['volume'] = volume.astype(np.int32)
+            
             logger.info(f"市場データ取得完了: {len(df)}件 ({symbol})")
             return df
             
@@ -121,117 +240,113 @@ class BacktestEngine:
         try:
             # 初期設定
             balance = initial_balance
-            positions = []
-            trades = []
-            equity_curve = []
             
             # テクニカル指標を計算
-            data = await self._calculate_technical_indicators(data, parameters)
+            data = self._calculate_technical_indicators(data, parameters)
             
             # 各時点でのシミュレーション
             start_index = min(10, len(data) - 5)  # スキャルピング用に開始を早める
             logger.info(f"バックテスト開始インデックス: {start_index}, 総データ数: {len(data)}")
             
+            # スキャルピング戦略は数値計算のみのためコンパイル済みカーネルで一括シミュレーション
+            if parameters.get('strategy_type', 'scalping') not in ('swing', 'dow_multi_timeframe'):
+                trades, equity_curve = self._simulate_scalping(
+                    data, parameters, start_index, initial_balance, risk_per_trade, max_positions
+                )
+                return self._analyze_results(trades, equity_curve, initial_balance)
+            
+            positions = PositionsSoA(max_positions)
+            
+            # 1バーで開くポジションは最大1件のため、取引件数はバー数を超えない
+            trade_rows = np.empty((len(data) - start_index + max_positions, TRADE_COLUMNS))
+            trade_count = 0
+            
+            # エクイティカーブ（各バーの総資産）
+            equity_curve = np.empty(len(data) - start_index)
+            
+            def close_position(slot: int, exit_index: int, exit_price: float, exit_reason: str) -> float:
+                nonlocal trade_count
+                profit = (exit_price - positions.entry_price[slot]) * positions.quantity[slot] * positions.side[slot]
+                trade_rows[trade_count] = (
+                    positions.side[slot], positions.entry_index[slot], exit_index, positions.entry_price[slot],
+                    exit_price, positions.quantity[slot], profit, EXIT_REASONS.index(exit_reason)
+                )
+                trade_count += 1
+                positions.active[slot] = False
+                return profit
+            
+            # バー毎の Series 生成を避けるため、ループ内で参照する列は NumPy 配列で保持する
+            close_values = data['close'].to_numpy(dtype=np.float64)
+            trend_values = data['trend'].to_numpy() if 'trend' in data.columns else np.zeros(len(data))
+            timestamp_ns = data.index.asi8
+            max_hold_ns = int(self._get_max_hold_hours(parameters) * 3.6e12)
+            
+            def schedule_stop_exit(slot: int, from_index: int):
+                # 最大保持期間を超えるバーまでに SL/TP へ到達するかを一度に探索する
+                horizon = np.searchsorted(timestamp_ns, timestamp_ns[positions.entry_index[slot]] + max_hold_ns, side='right')
+                positions.exit_index[slot], positions.exit_reason[slot] = self._find_stop_exit(
+                    close_values[from_index:horizon + 1], from_index,
+                    positions.side[slot], positions.stop_loss[slot], positions.take_profit[slot]
+                )
+            
             for i in range(start_index, len(data)):
-                current_time = data.index[i]
-                current_data = data.iloc[:i+1]  # 現在までのデータ
-                current_price = data.iloc[i]
+                current_close = close_values[i]
                 
                 # エントリーシグナルをチェック
-                if len(positions) < max_positions:
-                    signal = await self._generate_signal(current_data, parameters)
+                if positions.count() < max_positions:
+                    current_data = data.iloc[:i+1]  # 現在までのデータ
+                    signal = self._generate_signal(current_data, parameters)
                     
                     if signal['action'] == 'buy' or signal['action'] == 'sell':
                         # ポジションサイズを計算
                         position_size = self._calculate_position_size(
                             balance, 
-                            current_price['close'], 
-                            signal.get('stop_loss', current_price['close'] * 0.98),
+                            current_close, 
+                            signal.get('stop_loss', current_close * 0.98),
                             risk_per_trade
                         )
                         
                         if position_size > 0:
-                            # 新しいポジションを開始
-                            position = {
-                                'symbol': data.columns[0] if len(data.columns) > 0 else 'UNKNOWN',
-                                'side': signal['action'],
-                                'entry_time': current_time,
-                                'entry_price': current_price['close'],
-                                'quantity': position_size,
-                                'stop_loss': signal.get('stop_loss'),
-                                'take_profit': signal.get('take_profit'),
-                                'score': signal.get('score', 50)
-                            }
-                            positions.append(position)
-                
-                # 既存ポジションの管理
-                positions_to_close = []
+                            # 空きスロットに新しいポジションを開始
+                            slot = positions.open(
+                                1 if signal['action'] == 'buy' else -1,
+                                i,
+                                current_close,
+                                position_size,
+                                signal.get('stop_loss') or np.nan,
+                                signal.get('take_profit') or np.nan
+                            )
+                            schedule_stop_exit(slot, i)
                 
-                for pos_idx, position in enumerate(positions):
-                    should_close, exit_reason = await self._should_close_position(
-                        position, current_price, current_data, parameters
-                    )
+                # 既存ポジションの管理（エントリー順に決済）
+                for slot in positions.open_slots():
+                    if positions.exit_index[slot] == i:
+                        should_close, exit_reason = True, positions.exit_reason[slot]
+                    else:
+                        hold_hours = (timestamp_ns[i] - timestamp_ns[positions.entry_index[slot]]) / 3.6e12
+                        stop_loss = positions.stop_loss[slot]
+                        should_close, exit_reason, positions.stop_loss[slot] = self._should_close_position(
+                            positions.side[slot], hold_hours, stop_loss,
+                            current_close, trend_values[i], parameters
+                        )
+                        # トレーリングストップで更新された場合は次のバー以降の到達バーを探し直す
+                        new_stop_loss = positions.stop_loss[slot]
+                        if not should_close and not np.isnan(new_stop_loss) and new_stop_loss != stop_loss:
+                            schedule_stop_exit(slot, i + 1)
                     
                     if should_close:
-                        # ポジションを決済
-                        exit_price = current_price['close']
-                        
-                        if position['side'] == 'buy':
-                            profit = (exit_price - position['entry_price']) * position['quantity']
-                        else:  # sell
-                            profit = (position['entry_price'] - exit_price) * position['quantity']
-                        
-                        trade = {
-                            'symbol': position['symbol'],
-                            'side': position['side'],
-                            'entry_time': position['entry_time'].isoformat(),
-                            'exit_time': current_time.isoformat(),
-                            'entry_price': position['entry_price'],
-                            'exit_price': exit_price,
-                            'quantity': position['quantity'],
-                            'profit_loss': profit,
-                            'exit_reason': exit_reason
-                        }
-                        
-                        trades.append(trade)
-                        balance += profit
-                        positions_to_close.append(pos_idx)
-                
-                # 決済したポジションを削除
-                for idx in sorted(positions_to_close, reverse=True):
-                    positions.pop(idx)
+                        balance += close_position(slot, i, current_close, exit_reason)
                 
                 # エクイティカーブを記録
-                unrealized_pnl = self._calculate_unrealized_pnl(positions, current_price)
-                equity_curve.append({
-                    'timestamp': current_time,
-                    'balance': balance,
-                    'unrealized_pnl': unrealized_pnl,
-                    'total_equity': balance + unrealized_pnl
-                })
+                unrealized_pnl = self._calculate_unrealized_pnl(positions, current_close)
+                equity_curve[i - start_index] = balance + unrealized_pnl
             
             # 残りのポジションを強制決済
-            final_price = data.iloc[-1]
-            for position in positions:
-                if position['side'] == 'buy':
-                    profit = (final_price['close'] - position['entry_price']) * position['quantity']
-                else:
-                    profit = (position['entry_price'] - final_price['close']) * position['quantity']
-                
-                trade = {
-                    'symbol': position['symbol'],
-                    'side': position['side'],
-                    'entry_time': position['entry_time'].isoformat(),
-                    'exit_time': data.index[-1].isoformat(),
-                    'entry_price': position['entry_price'],
-                    'exit_price': final_price['close'],
-                    'quantity': position['quantity'],
-                    'profit_loss': profit,
-                    'exit_reason': 'backtest_end'
-                }
-                
-                trades.append(trade)
-                balance += profit
+            final_close = close_values[-1]
+            for slot in positions.open_slots():
+                balance += close_position(slot, len(data) - 1, final_close, 'backtest_end')
+            
+            trades = self._build_trade_records(data, trade_rows[:trade_count])
             
             # 結果を分析
             analysis = self._analyze_results(trades, equity_curve, initial_balance)
@@ -242,7 +357,81 @@ class BacktestEngine:
             logger.error(f"バックテスト実行エラー: {str(e)}")
             raise
     
-    async def _calculate_technical_indicators(self, data: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
+    def _simulate_scalping(
+        self,
+        data: pd.DataFrame,
+        parameters: Dict[str, Any],
+        start_index: int,
+        initial_balance: float,
+        risk_per_trade: float,
+        max_positions: int
+    ) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """
+        スキャルピング戦略をカーネルで実行し、取引履歴とエクイティカーブ（各バーの総資産）を返す
+        """
+        def column(name: str) -> np.ndarray:
+            if name in data.columns:
+                return np.ascontiguousarray(data[name].to_numpy(dtype=np.float64))
+            return np.full(len(data), np.nan)
+        
+        entry_threshold = float(parameters.get('entry_threshold', 50))
+        scores = self._calculate_scalping_scores(
+            column('close'), column('close_pct'), column('prev_close_pct'),
+            column('short_ma5'), column('short_std5'), column('rsi'), column('ma')
+        )
+        actions = np.where(scores >= entry_threshold, 1, np.where(scores <= -entry_threshold, -1, 0)).astype(np.int64)
+        
+        trade_rows, balances, unrealized = simulate_scalping(
+            column('close'),
+            actions,
+            np.nan_to_num(column('trend')),
+            np.ascontiguousarray(data.index.asi8),
+            start_index,
+            float(parameters.get('max_hold_hours', 1)),
+            float(initial_balance),
+            float(risk_per_trade),
+            int(max_positions)
+        )
+        
+        trades = self._build_trade_records(data, trade_rows)
+        
+        return trades, balances + unrealized
+    
+    def _build_trade_records(self, data: pd.DataFrame, trade_rows: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        取引配列（TRADE_COLUMNS 列）を取引履歴の辞書リストに変換
+        """
+        symbol = data.columns[0] if len(data.columns) > 0 else 'UNKNOWN'
+        
+        # 時刻の文字列化は取引のあったバーだけをまとめて行う
+        entry_times = data.index[trade_rows[:, TRADE_ENTRY_INDEX].astype(np.int64)].strftime('%Y-%m-%dT%H:%M:%S')
+        exit_times = data.index[trade_rows[:, TRADE_EXIT_INDEX].astype(np.int64)].strftime('%Y-%m-%dT%H:%M:%S')
+        
+        return [
+            {
+                'symbol': symbol,
+                'side': 'buy' if side == 1 else 'sell',
+                'entry_time': entry_time,
+                'exit_time': exit_time,
+                'entry_price': entry_price,
+                'exit_price': exit_price,
+                'quantity': quantity,
+                'profit_loss': profit_loss,
+                'exit_reason': EXIT_REASONS[int(exit_reason)]
+            }
+            for side, entry_time, exit_time, entry_price, exit_price, quantity, profit_loss, exit_reason in zip(
+                trade_rows[:, TRADE_SIDE].tolist(),
+                entry_times,
+                exit_times,
+                trade_rows[:, TRADE_ENTRY_PRICE].tolist(),
+                trade_rows[:, TRADE_EXIT_PRICE].tolist(),
+                trade_rows[:, TRADE_QUANTITY].tolist(),
+                trade_rows[:, TRADE_PROFIT_LOSS].tolist(),
+                trade_rows[:, TRADE_EXIT_REASON].tolist()
+            )
+        ]
+    
+    def _calculate_technical_indicators(self, data: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
         """
         テクニカル指標を計算
         """
@@ -266,9 +455,19 @@ class BacktestEngine:
             atr_period = parameters.get('atr_period', 14)
             data['atr'] = self._calculate_atr(data, atr_period)
             
+            # スキャルピング用の短期特徴量（バー毎に直近データを切り出して再計算しないよう一括で算出）
+            data['close_pct'] = data['close'].pct_change()
+            data['prev_close_pct'] = data['close_pct'].shift(1)
+            data['short_ma5'] = data['close'].rolling(window=5).mean()
+            data['short_std5'] = data['close'].rolling(window=5).std()
+            
+            # 指標の有効フラグ（シグナル生成でバー毎に欠損判定しないよう一括で算出）
+            for column in ('ma', 'rsi', 'atr', 'short_ma5'):
+                data[f'{column}_valid'] = data[column].notna()
+            
             # ダウ理論関連
             swing_threshold = parameters.get('swing_threshold', 0.5)
-            data = await self._calculate_dow_theory_signals(data, swing_threshold)
+            data = self._calculate_dow_theory_signals(data, swing_threshold)
             
             return data
             
@@ -277,82 +476,63 @@ class BacktestEngine:
             return data
     
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
-        """RSIを計算"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        """RSIを計算（Wilder の平滑化）"""
+        rsi = rsi_wilder(np.ascontiguousarray(prices.to_numpy(dtype=np.float64)), int(period))
+        return pd.Series(rsi, index=prices.index)
     
     def _calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std_dev: float = 2) -> Tuple[pd.Series, pd.Series]:
         """ボリンジャーバンドを計算"""
-        ma = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
-        upper = ma + (std * std_dev)
-        lower = ma - (std * std_dev)
-        return upper, lower
+        upper, lower = bollinger_bands(
+            np.ascontiguousarray(prices.to_numpy(dtype=np.float64)), int(period), float(std_dev)
+        )
+        return pd.Series(upper, index=prices.index), pd.Series(lower, index=prices.index)
     
     def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
-        """ATRを計算"""
-        high_low = data['high'] - data['low']
-        high_close = np.abs(data['high'] - data['close'].shift())
-        low_close = np.abs(data['low'] - data['close'].shift())
-        
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
-        return atr
+        """ATRを計算（Wilder の平滑化）"""
+        atr = atr_wilder(
+            np.ascontiguousarray(data['high'].to_numpy(dtype=np.float64)),
+            np.ascontiguousarray(data['low'].to_numpy(dtype=np.float64)),
+            np.ascontiguousarray(data['close'].to_numpy(dtype=np.float64)),
+            int(period)
+        )
+        return pd.Series(atr, index=data.index)
     
-    async def _calculate_dow_theory_signals(self, data: pd.DataFrame, threshold: float) -> pd.DataFrame:
+    def _calculate_dow_theory_signals(self, data: pd.DataFrame, threshold: float) -> pd.DataFrame:
         """
         ダウ理論に基づくシグナルを計算
         """
         try:
-            # スイングポイントを検出
-            data['swing_high'] = False
-            data['swing_low'] = False
-            
+            # スイングポイントを検出（全バー分のマスクを作り、列へは一度だけ代入する）
             window = 5  # 前後5本のローソク足でスイングポイントを判定
-            
-            for i in range(window, len(data) - window):
-                # スイングハイの判定
-                is_swing_high = True
-                for j in range(i - window, i + window + 1):
-                    if j != i and data.iloc[j]['high'] >= data.iloc[i]['high']:
-                        is_swing_high = False
-                        break
-                
-                if is_swing_high:
-                    data.iloc[i, data.columns.get_loc('swing_high')] = True
-                
-                # スイングローの判定
-                is_swing_low = True
-                for j in range(i - window, i + window + 1):
-                    if j != i and data.iloc[j]['low'] <= data.iloc[i]['low']:
-                        is_swing_low = False
-                        break
+            swing_high_mask = np.zeros(len(data), dtype=bool)
+            swing_low_mask = np.zeros(len(data), dtype=bool)
+            
+            if len(data) > 2 * window:
+                # 前後 window 本の窓で、中央の足が他のすべての足より厳密に高い（安い）ものをスイングポイントとする
+                highs = np.lib.stride_tricks.sliding_window_view(data['high'].to_numpy(), 2 * window + 1)
+                lows = np.lib.stride_tricks.sliding_window_view(data['low'].to_numpy(), 2 * window + 1)
+                center_highs = highs[:, window:window + 1]
+                center_lows = lows[:, window:window + 1]
                 
-                if is_swing_low:
-                    data.iloc[i, data.columns.get_loc('swing_low')] = True
+                swing_high_mask[window:-window] = (highs < center_highs).sum(axis=1) == 2 * window
+                swing_low_mask[window:-window] = (lows > center_lows).sum(axis=1) == 2 * window
             
-            # トレンド方向を判定
-            data['trend'] = 0  # 0: 横ばい, 1: 上昇, -1: 下降
+            data['swing_high'] = swing_high_mask
+            data['swing_low'] = swing_low_mask
             
-            swing_highs = data[data['swing_high']]['high']
-            swing_lows = data[data['swing_low']]['low']
+            # トレンド方向を判定（0: 横ばい, 1: 上昇, -1: 下降）
+            trend = np.zeros(len(data), dtype=np.int8)
+            swing_high_prices = data['high'].to_numpy()[swing_high_mask]
+            swing_low_prices = data['low'].to_numpy()[swing_low_mask]
             
-            # 最近のスイングポイントからトレンドを判定
-            if len(swing_highs) >= 2 and len(swing_lows) >= 2:
-                recent_highs = swing_highs.tail(2)
-                recent_lows = swing_lows.tail(2)
-                
-                if len(recent_highs) >= 2 and recent_highs.iloc[-1] > recent_highs.iloc[-2]:
-                    if len(recent_lows) >= 2 and recent_lows.iloc[-1] > recent_lows.iloc[-2]:
-                        data.iloc[-50:, data.columns.get_loc('trend')] = 1  # 上昇トレンド
-                
-                if len(recent_highs) >= 2 and recent_highs.iloc[-1] < recent_highs.iloc[-2]:
-                    if len(recent_lows) >= 2 and recent_lows.iloc[-1] < recent_lows.iloc[-2]:
-                        data.iloc[-50:, data.columns.get_loc('trend')] = -1  # 下降トレンド
+            # 最近のスイングポイントからトレンドを判定し、直近50本に設定
+            if len(swing_high_prices) >= 2 and len(swing_low_prices) >= 2:
+                if swing_high_prices[-1] > swing_high_prices[-2] and swing_low_prices[-1] > swing_low_prices[-2]:
+                    trend[-50:] = 1  # 上昇トレンド
+                elif swing_high_prices[-1] < swing_high_prices[-2] and swing_low_prices[-1] < swing_low_prices[-2]:
+                    trend[-50:] = -1  # 下降トレンド
+            
+            data['trend'] = trend
             
             return data
             
@@ -360,7 +540,7 @@ class BacktestEngine:
             logger.error(f"ダウ理論シグナル計算エラー: {str(e)}")
             return data
     
-    async def _generate_signal(self, data: pd.DataFrame, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_signal(self, data: pd.DataFrame, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
         エントリーシグナルを生成（戦略選択対応）
         """
@@ -369,17 +549,17 @@ class BacktestEngine:
             strategy_type = parameters.get('strategy_type', 'scalping')
             
             if strategy_type == 'swing':
-                return await self._generate_swing_signal(data, parameters)
+                return self._generate_swing_signal(data, parameters)
             elif strategy_type == 'dow_multi_timeframe':
-                return await self._generate_dow_multi_timeframe_signal(data, parameters)
+                return self._generate_dow_multi_timeframe_signal(data, parameters)
             else:
-                return await self._generate_scalping_signal(data, parameters)
+                return self._generate_scalping_signal(data, parameters)
                 
         except Exception as e:
             logger.error(f"シグナル生成エラー: {str(e)}")
             return {'action': 'hold', 'score': 0}
     
-    async def _generate_swing_signal(self, data: pd.DataFrame, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_swing_signal(self, data: pd.DataFrame, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
         スイングトレード戦略のシグナル生成
         ダウ理論とエリオット波動を活用
@@ -397,19 +577,13 @@ class BacktestEngine:
             if len(data) < 50:
                 return signal
             
-            # ダウ理論によるトレンド分析
-            market_data_list = data.reset_index().to_dict('records')
-            for record in market_data_list:
-                record['timestamp'] = record['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-            
-            analysis_result = self.technical_service.analyze_market_data(market_data_list)
-            
-            if 'error' in analysis_result:
-                logger.error(f"Technical analysis error: {analysis_result['error']}")
+            # ダウ理論によるトレンド分析（swing_lookback 指定時は直近の期間のみを分析）
+            lookback = parameters.get('swing_lookback')
+            analysis = self._analyze_swing_trend(data, lookback)
+            if analysis is None:
                 return signal
             
-            trend_analysis = analysis_result.get('trend_analysis', {})
-            swing_points = analysis_result.get('swing_points', [])
+            trend_analysis, swing_points, swing_points_count = analysis
             
             # トレンド判定
             trend = trend_analysis.get('trend', 'sideways')
@@ -457,7 +631,7 @@ class BacktestEngine:
                         score += 20  # 上昇トレンドでの押し目は買いシグナル
             
             # 4. RSIによる過熱感チェック（+/-20点）
-            if 'rsi' in current and not pd.isna(current['rsi']):
+            if current.get('rsi_valid', False):
                 rsi = current['rsi']
                 if rsi < 30 and trend == 'uptrend':
                     score += 20  # 売られすぎからの反発期待
@@ -469,7 +643,7 @@ class BacktestEngine:
                     score -= 10  # 適正レンジでの下降トレンド
             
             # 5. ボラティリティチェック（ATRベース）
-            if 'atr' in current and not pd.isna(current['atr']):
+            if current.get('atr_valid', False):
                 atr = current['atr']
                 atr_ratio = atr / current_price
                 
@@ -524,7 +698,7 @@ class BacktestEngine:
             signal['analysis'] = {
                 'trend': trend,
                 'trend_strength': trend_strength,
-                'swing_points_count': len(swing_points),
+                'swing_points_count': swing_points_count,
                 'last_high': recent_highs[-1]['price'] if recent_highs else None,
                 'last_low': recent_lows[-1]['price'] if recent_lows else None,
                 'rsi': current.get('rsi'),
@@ -541,13 +715,12 @@ class BacktestEngine:
             logger.error(f"スイングシグナル生成エラー: {str(e)}")
             return {'action': 'hold', 'score': 0}
     
-    async def _generate_scalping_signal(self, data: pd.DataFrame, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_scalping_signal(self, data: pd.DataFrame, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
         スキャルピング戦略のシグナル生成（既存のロジック）
         """
         try:
             current = data.iloc[-1]
-            prev = data.iloc[-2] if len(data) > 1 else current
             
             signal = {
                 'action': 'hold',
@@ -558,22 +731,21 @@ class BacktestEngine:
             
             # 高頻度スキャルピング戦略
             score = 0
+            price_change = None
             
-            # 短期価格変動ベースの高頻度戦略
-            if len(data) >= 5:
-                # 直近5期間の価格変動を分析
-                recent_prices = data['close'].tail(5)
-                short_ma = recent_prices.mean()
+            # 短期価格変動ベースの高頻度戦略（特徴量は _calculate_technical_indicators で算出済み）
+            if current.get('short_ma5_valid', False):
                 current_price_val = current['close']
+                short_ma = current['short_ma5']
                 
                 # 短期移動平均からの乖離率
                 ma_deviation = (current_price_val - short_ma) / short_ma
                 
                 # 直前の価格変動（スキャルピング用の小さな値）
-                price_change = (current['close'] - prev['close']) / prev['close']
+                price_change = current['close_pct']
                 
                 # ボラティリティ（直近5期間の標準偏差）
-                volatility = recent_prices.std() / recent_prices.mean()
+                volatility = current['short_std5'] / short_ma
                 
                 # 厳選された取引条件（質重視のスキャルピング）
                 # 0.05%以上の明確な変動で反応（より厳格に）
@@ -589,12 +761,11 @@ class BacktestEngine:
                     score -= 25
                 
                 # 勢いの継続性チェック（連続する方向性）
-                if len(data) >= 3:
-                    prev_change = (prev['close'] - data['close'].iloc[-3]) / data['close'].iloc[-3]
-                    if price_change > 0 and prev_change > 0:  # 連続上昇
-                        score += 15
-                    elif price_change < 0 and prev_change < 0:  # 連続下落
-                        score -= 15
+                prev_change = current['prev_close_pct']
+                if price_change > 0 and prev_change > 0:  # 連続上昇
+                    score += 15
+                elif price_change < 0 and prev_change < 0:  # 連続下落
+                    score -= 15
                 
                 # ボラティリティフィルター（適度なボラティリティのみ）
                 if 0.0008 < volatility < 0.003:  # 適度なボラティリティ範囲
@@ -603,20 +774,20 @@ class BacktestEngine:
                     score = int(score * 0.8)
             
             # RSIがある場合はそれも考慮
-            if not pd.isna(current.get('rsi', float('nan'))):
+            if current.get('rsi_valid', False):
                 if current['rsi'] < 40:  # 売られすぎ
                     score += 20
                 elif current['rsi'] > 60:  # 買われすぎ
                     score -= 20
             
             # 移動平均との関係
-            if not pd.isna(current.get('ma', float('nan'))):
+            if current.get('ma_valid', False):
                 if current['close'] > current['ma']:
                     score += 10
                 elif current['close'] < current['ma']:
                     score -= 10
             
-            logger.info(f"Signal debug - Price change: {price_change if len(data) >= 2 else 'N/A'}, Score: {score}, RSI: {current.get('rsi', 'N/A')}, MA: {current.get('ma', 'N/A')}, Close: {current['close']}")
+            logger.info(f"Signal debug - Price change: {price_change if price_change is not None else 'N/A'}, Score: {score}, RSI: {current.get('rsi', 'N/A')}, MA: {current.get('ma', 'N/A')}, Close: {current['close']}")
             
             # シグナル判定
             entry_threshold = parameters.get('entry_threshold', 50)
@@ -642,6 +813,42 @@ class BacktestEngine:
             logger.error(f"シグナル生成エラー: {str(e)}")
             return {'action': 'hold', 'score': 0}
     
+    def _calculate_scalping_scores(
+        self,
+        close: np.ndarray,
+        close_pct: np.ndarray,
+        prev_close_pct: np.ndarray,
+        short_ma: np.ndarray,
+        short_std: np.ndarray,
+        rsi: np.ndarray,
+        ma: np.ndarray
+    ) -> np.ndarray:
+        """
+        全バーのスキャルピングスコアを一括計算（_generate_scalping_signal と同じ採点）
+        NaN との比較は常に False になるため、未計算の指標は加点・減点されない
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ma_deviation = (close - short_ma) / short_ma
+            volatility = short_std / short_ma
+            
+            score = np.where(close_pct > 0.0005, 50, np.where(close_pct < -0.0005, -50, 0))
+            score += np.where(ma_deviation > 0.0008, 25, np.where(ma_deviation < -0.0008, -25, 0))
+            score += np.where(
+                (close_pct > 0) & (prev_close_pct > 0), 15,
+                np.where((close_pct < 0) & (prev_close_pct < 0), -15, 0)
+            )
+            score = np.where(
+                (volatility > 0.0008) & (volatility < 0.003), np.trunc(score * 1.2),
+                np.where(volatility > 0.005, np.trunc(score * 0.8), score)
+            )
+            # 直近5期間が揃うまでは価格変動ベースの採点を行わない
+            score = np.where(np.isnan(short_ma), 0, score)
+            
+            score += np.where(rsi < 40, 20, np.where(rsi > 60, -20, 0))
+            score += np.where(close > ma, 10, np.where(close < ma, -10, 0))
+        
+        return score
+    
     def _calculate_position_size(self, balance: float, entry_price: float, stop_loss: float, risk_per_trade: float) -> float:
         """
         ポジションサイズを計算
@@ -660,79 +867,109 @@ class BacktestEngine:
             logger.error(f"ポジションサイズ計算エラー: {str(e)}")
             return 0.01
     
-    async def _should_close_position(
+    def _should_close_position(
         self, 
-        position: Dict[str, Any], 
-        current_price: pd.Series, 
-        data: pd.DataFrame, 
+        side: int,
+        hold_hours: float,
+        stop_loss: float,
+        current_close: float, 
+        current_trend: int, 
         parameters: Dict[str, Any]
-    ) -> Tuple[bool, str]:
+    ) -> Tuple[bool, str, float]:
         """
-        ポジションを決済すべきかを判定
+        ストップロス・テイクプロフィット以外の決済条件を判定
+        （SL/TP は _execute_backtest で全ポジションを一括判定する）
+        
+        Returns:
+            tuple: (決済するか, 決済理由, 更新後のストップロス)
         """
         try:
-            # ストップロス・テイクプロフィットチェック
-            if position['side'] == 'buy':
-                if position['stop_loss'] and current_price['close'] <= position['stop_loss']:
-                    return True, 'stop_loss'
-                if position['take_profit'] and current_price['close'] >= position['take_profit']:
-                    return True, 'take_profit'
-            else:  # sell
-                if position['stop_loss'] and current_price['close'] >= position['stop_loss']:
-                    return True, 'stop_loss'
-                if position['take_profit'] and current_price['close'] <= position['take_profit']:
-                    return True, 'take_profit'
-            
             # 時間ベースの決済（最大保持期間）
             strategy_type = parameters.get('strategy_type', 'scalping')
-            if strategy_type == 'swing':
-                max_hold_hours = parameters.get('swing_max_hold_hours', 24 * 5)  # スイングは5日
-            else:
-                max_hold_hours = parameters.get('max_hold_hours', 1)  # スキャルピングは1時間
-                
-            hold_time = data.index[-1] - position['entry_time']
-            
-            if hold_time.total_seconds() / 3600 > max_hold_hours:
-                return True, 'time_limit'
+            if hold_hours > self._get_max_hold_hours(parameters):
+                return True, 'time_limit', stop_loss
             
             # スイング戦略の場合、トレーリングストップを実装
             if strategy_type == 'swing' and parameters.get('use_trailing_stop', True):
-                trailing_stop_updated = await self._update_trailing_stop(position, current_price, parameters)
+                trailing_stop_updated = self._update_trailing_stop(side, stop_loss, current_close, parameters)
                 if trailing_stop_updated:
-                    position['stop_loss'] = trailing_stop_updated
+                    stop_loss = trailing_stop_updated
             
             # トレンド転換チェック
-            current = data.iloc[-1]
-            if position['side'] == 'buy' and current.get('trend', 0) == -1:
-                return True, 'trend_reversal'
-            elif position['side'] == 'sell' and current.get('trend', 0) == 1:
-                return True, 'trend_reversal'
+            if side == 1 and current_trend == -1:
+                return True, 'trend_reversal', stop_loss
+            elif side == -1 and current_trend == 1:
+                return True, 'trend_reversal', stop_loss
             
-            return False, ''
+            return False, '', stop_loss
             
         except Exception as e:
             logger.error(f"ポジション決済判定エラー: {str(e)}")
-            return False, 'error'
+            return False, 'error', stop_loss
+    
+    def _get_max_hold_hours(self, parameters: Dict[str, Any]) -> float:
+        """戦略毎の最大保持時間"""
+        if parameters.get('strategy_type', 'scalping') == 'swing':
+            return parameters.get('swing_max_hold_hours', 24 * 5)  # スイングは5日
+        return parameters.get('max_hold_hours', 1)  # スキャルピングは1時間
     
-    async def _update_trailing_stop(self, position: Dict[str, Any], current_price: pd.Series, parameters: Dict[str, Any]) -> Optional[float]:
+    def _find_stop_exit(
+        self,
+        future_close: np.ndarray,
+        start_index: int,
+        side: int,
+        stop_loss: float,
+        take_profit: float
+    ) -> Tuple[int, Optional[str]]:
+        """
+        ストップロス・テイクプロフィットに最初に到達するバーを求める
+        （同じバーで両方に到達した場合はストップロスを優先）
+        
+        Args:
+            future_close: start_index 以降の終値
+            start_index: future_close[0] のバーのインデックス
+            side: 1: buy, -1: sell
+            stop_loss: ストップロス（未設定は NaN）
+            take_profit: テイクプロフィット（未設定は NaN）
+            
+        Returns:
+            tuple: (到達バーのインデックス, 決済理由)。到達しない場合は (-1, None)
+        """
+        if side == 1:
+            hit_stop_loss = future_close <= stop_loss
+            hit_take_profit = future_close >= take_profit
+        else:
+            hit_stop_loss = future_close >= stop_loss
+            hit_take_profit = future_close <= take_profit
+        
+        no_hit = len(future_close)
+        first_stop_loss = hit_stop_loss.argmax() if hit_stop_loss.any() else no_hit
+        first_take_profit = hit_take_profit.argmax() if hit_take_profit.any() else no_hit
+        
+        if first_stop_loss == no_hit and first_take_profit == no_hit:
+            return -1, None
+        if first_stop_loss <= first_take_profit:
+            return start_index + int(first_stop_loss), 'stop_loss'
+        return start_index + int(first_take_profit), 'take_profit'
+    
+    def _update_trailing_stop(self, side: int, stop_loss: float, current_close: float, parameters: Dict[str, Any]) -> Optional[float]:
         """
         トレーリングストップの更新
         """
         try:
             trailing_stop_distance = parameters.get('trailing_stop_distance', 0.005)  # 0.5%
-            current_close = current_price['close']
             
-            if position['side'] == 'buy':
+            if side == 1:
                 # 買いポジション：価格が上昇したらストップロスを引き上げる
                 new_stop_loss = current_close * (1 - trailing_stop_distance)
-                if new_stop_loss > position['stop_loss']:
-                    logger.info(f"Trailing stop updated for BUY: {position['stop_loss']:.5f} -> {new_stop_loss:.5f}")
+                if new_stop_loss > stop_loss:
+                    logger.info(f"Trailing stop updated for BUY: {stop_loss:.5f} -> {new_stop_loss:.5f}")
                     return new_stop_loss
             else:
                 # 売りポジション：価格が下落したらストップロスを引き下げる
                 new_stop_loss = current_close * (1 + trailing_stop_distance)
-                if new_stop_loss < position['stop_loss']:
-                    logger.info(f"Trailing stop updated for SELL: {position['stop_loss']:.5f} -> {new_stop_loss:.5f}")
+                if new_stop_loss < stop_loss:
+                    logger.info(f"Trailing stop updated for SELL: {stop_loss:.5f} -> {new_stop_loss:.5f}")
                     return new_stop_loss
             
             return None
@@ -741,28 +978,19 @@ class BacktestEngine:
             logger.error(f"トレーリングストップ更新エラー: {str(e)}")
             return None
     
-    def _calculate_unrealized_pnl(self, positions: List[Dict[str, Any]], current_price: pd.Series) -> float:
+    def _calculate_unrealized_pnl(self, positions: PositionsSoA, current_close: float) -> float:
         """
-        未実現損益を計算
+        保有中ポジションの未実現損益を計算
         """
         try:
-            total_unrealized = 0
-            
-            for position in positions:
-                if position['side'] == 'buy':
-                    unrealized = (current_price['close'] - position['entry_price']) * position['quantity']
-                else:  # sell
-                    unrealized = (position['entry_price'] - current_price['close']) * position['quantity']
-                
-                total_unrealized += unrealized
-            
-            return total_unrealized
+            active = positions.active
+            return float(np.sum((current_close - positions.entry_price[active]) * positions.quantity[active] * positions.side[active]))
             
         except Exception as e:
             logger.error(f"未実現損益計算エラー: {str(e)}")
             return 0
     
-    def _analyze_results(self, trades: List[Dict[str, Any]], equity_curve: List[Dict[str, Any]], initial_balance: float) -> Dict[str, Any]:
+    def _analyze_results(self, trades: List[Dict[str, Any]], equity_curve: np.ndarray, initial_balance: float) -> Dict[str, Any]:
         """
         バックテスト結果を分析
         """
@@ -791,11 +1019,8 @@ class BacktestEngine:
             avg_loss = np.mean(losses) if losses else 0
             profit_factor = abs(sum(profits) / sum(losses)) if losses else float('inf')
             
-            # 最大ドローダウンを計算
-            max_drawdown = self._calculate_max_drawdown(equity_curve, initial_balance)
-            
-            # シャープレシオを計算
-            sharpe_ratio = self._calculate_sharpe_ratio(equity_curve)
+            # 最大ドローダウンとシャープレシオを計算
+            max_drawdown, sharpe_ratio = self._calculate_risk_metrics(equity_curve, initial_balance)
             
             # 最終残高と収益率の計算
             final_balance = initial_balance + total_profit
@@ -842,65 +1067,87 @@ class BacktestEngine:
                 'trades': trades
             }
     
-    def _calculate_max_drawdown(self, equity_curve: List[Dict[str, Any]], initial_balance: float) -> float:
+    def _calculate_risk_metrics(self, equity_curve: np.ndarray, initial_balance: float) -> Tuple[float, Optional[float]]:
         """
-        最大ドローダウンを計算
+        最大ドローダウン（%）とシャープレシオをエクイティカーブ（各時点の総資産）の1回の走査で計算
         """
         try:
-            if not equity_curve:
-                return 0
+            if len(equity_curve) == 0:
+                return 0, None
             
-            peak = initial_balance
-            max_dd = 0
+            equity = np.ascontiguousarray(equity_curve, dtype=np.float64)
+            max_dd, avg_return, std_return, return_count = equity_stats(equity, float(initial_balance))
             
-            for point in equity_curve:
-                equity = point['total_equity']
-                if equity > peak:
-                    peak = equity
-                
-                drawdown = (peak - equity) / peak
-                if drawdown > max_dd:
-                    max_dd = drawdown
+            if return_count > 0 and std_return > 0:
+                sharpe_ratio = avg_return / std_return * np.sqrt(252)  # 年率化
+            else:
+                sharpe_ratio = None
             
-            return max_dd * 100  # パーセンテージで返す
+            return max_dd * 100, sharpe_ratio  # ドローダウンはパーセンテージで返す
             
         except Exception as e:
-            logger.error(f"最大ドローダウン計算エラー: {str(e)}")
-            return 0
+            logger.error(f"リスク指標計算エラー: {str(e)}")
+            return 0, None
     
-    def _calculate_sharpe_ratio(self, equity_curve: List[Dict[str, Any]]) -> Optional[float]:
+    def _calculate_max_drawdown(self, equity_curve: np.ndarray, initial_balance: float) -> float:
+        """
+        最大ドローダウンを計算
+        """
+        return self._calculate_risk_metrics(equity_curve, initial_balance)[0]
+    
+    def _calculate_sharpe_ratio(self, equity_curve: np.ndarray) -> Optional[float]:
         """
         シャープレシオを計算
         """
-        try:
-            if len(equity_curve) < 2:
-                return None
-            
-            returns = []
-            for i in range(1, len(equity_curve)):
-                prev_equity = equity_curve[i-1]['total_equity']
-                curr_equity = equity_curve[i]['total_equity']
-                
-                if prev_equity > 0:
-                    daily_return = (curr_equity - prev_equity) / prev_equity
-                    returns.append(daily_return)
-            
-            if not returns:
-                return None
-            
-            avg_return = np.mean(returns)
-            std_return = np.std(returns)
-            
-            if std_return > 0:
-                return avg_return / std_return * np.sqrt(252)  # 年率化
-            else:
-                return None
-                
-        except Exception as e:
-            logger.error(f"シャープレシオ計算エラー: {str(e)}")
+        if len(equity_curve) < 2:
             return None
+        return self._calculate_risk_metrics(equity_curve, equity_curve[0])[1]
     
-    async def _generate_dow_multi_timeframe_signal(self, data: pd.DataFrame, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_swing_trend(self, data: pd.DataFrame, lookback: Optional[int]) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]], int]]:
+        """
+        スイング戦略用のトレンド分析
+        同じ市場データ・同じバー数の分析結果は市場データのキャッシュエントリに保持し、
+        同一データでのバックテスト再実行時に再利用する
+        
+        Returns:
+            Optional[Tuple]: (トレンド分析結果, 直近10件のスイングポイント, スイングポイント数)。分析エラー時は None
+        """
+        source = data.attrs.get('source')
+        cache_key = (len(data), lookback)
+        results = None
+        if source is not None:
+            entry = _market_data_cache.get(source[0])
+            # 再読み込みされた別のデータのエントリであれば使用しない
+            if entry is not None and entry[0].attrs.get('source') == source:
+                results = entry[1]
+                analysis = results.get(cache_key)
+                if analysis is not None:
+                    return analysis
+        
+        recent = data.iloc[-int(lookback):] if lookback else data
+        analysis_frame = pd.DataFrame({
+            'timestamp': recent.index.strftime('%Y-%m-%d %H:%M:%S'),
+            'open': recent['open'].to_numpy(),
+            'high': recent['high'].to_numpy(),
+            'low': recent['low'].to_numpy(),
+            'close': recent['close'].to_numpy(),
+            'volume': recent['volume'].to_numpy()
+        })
+        
+        analysis_result = self.technical_service.analyze_dataframe(analysis_frame)
+        
+        if 'error' in analysis_result:
+            logger.error(f"Technical analysis error: {analysis_result['error']}")
+            return None
+        
+        # シグナル判定で参照するのは直近10件のスイングポイントのみのため、それだけを保持する
+        swing_points = analysis_result.get('swing_points', [])
+        analysis = (analysis_result.get('trend_analysis', {}), swing_points[-10:], len(swing_points))
+        if results is not None:
+            results[cache_key] = analysis
+        return analysis
+    
+    def _generate_dow_multi_timeframe_signal(self, data: pd.DataFrame, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
         マルチタイムフレーム・ダウ理論戦略
         上位足・下位足を組み合わせたトレンド分析
@@ -922,7 +1169,7 @@ class BacktestEngine:
             multi_tf_analysis = {}
             for tf_name, period in timeframes.items():
                 tf_data = data.tail(min(period * 3, len(data)))
-                tf_analysis = await self._analyze_dow_theory_timeframe(tf_data, period, tf_name)
+                tf_analysis = self._analyze_dow_theory_timeframe(tf_data, period, tf_name)
                 multi_tf_analysis[tf_name] = tf_analysis
             
             # === トレンド統合判定 ===
@@ -980,7 +1227,7 @@ class BacktestEngine:
             logger.error(f"マルチタイムフレーム・ダウ理論戦略エラー: {str(e)}")
             return {'action': 'hold', 'score': 0, 'stop_loss': None, 'take_profit': None, 'analysis': {'error': str(e)}}
     
-    async def _analyze_dow_theory_timeframe(self, data: pd.DataFrame, period: int, tf_name: str) -> Dict[str, Any]:
+    def _analyze_dow_theory_timeframe(self, data: pd.DataFrame, period: int, tf_name: str) -> Dict[str, Any]:
         """特定時間軸でのダウ理論分析"""
         try:
             if len(data) < period:
@@ -992,20 +1239,22 @@ class BacktestEngine:
             swing_highs = []
             swing_lows = []
             
-            for i in range(swing_period, len(data) - swing_period):
-                # スイングハイ検出
-                if (data['high'].iloc[i] == data['high'].iloc[i-swing_period:i+swing_period+1].max()):
-                    swing_highs.append({
-                        'index': i,
-                        'price': data['high'].iloc[i],
-                    })
+            if len(data) > 2 * swing_period:
+                # 前後 swing_period 本の窓の最高値（最安値）と一致する足をスイングハイ（ロー）とする
+                highs = data['high'].to_numpy()
+                lows = data['low'].to_numpy()
+                window = 2 * swing_period + 1
+                center = slice(swing_period, len(data) - swing_period)
+                
+                high_indices = swing_period + np.flatnonzero(
+                    highs[center] == np.lib.stride_tricks.sliding_window_view(highs, window).max(axis=1)
+                )
+                low_indices = swing_period + np.flatnonzero(
+                    lows[center] == np.lib.stride_tricks.sliding_window_view(lows, window).min(axis=1)
+                )
                 
-                # スイングロー検出
-                if (data['low'].iloc[i] == data['low'].iloc[i-swing_period:i+swing_period+1].min()):
-                    swing_lows.append({
-                        'index': i,
-                        'price': data['low'].iloc[i],
-                    })
+                swing_highs = [{'index': int(i), 'price': price} for i, price in zip(high_indices, highs[high_indices])]
+                swing_lows = [{'index': int(i), 'price': price} for i, price in zip(low_indices, lows[low_indices])]
             
             # ダウ理論トレンド判定
             trend_analysis = self._analyze_dow_trend_detailed(swing_highs, swing_lows, tf_name)
@@ -1315,4 +1564,25 @@ class BacktestEngine:
             return stop_loss, take_profit
             
         except Exception as e:
-            return None, None
\ No newline at end of file
+            return None, None
+
+_worker_engine: Optional[BacktestEngine] = None
+
+def _init_backtest_worker(db_path: str, log_queue=None):
+    """ワーカープロセスの初期化（エンジンはプロセス毎に1つだけ生成し、市場データキャッシュを共有する）"""
+    global _worker_engine
+    setup_worker_logging(log_queue)
+    db_manager.db_path = db_path
+    _worker_engine = BacktestEngine()
+    warmup_kernels()
+
+def _run_backtest_worker(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    単一バックテストの実行
+    ProcessPoolExecutor のワーカーから呼び出せるようモジュールレベルで定義する
+    """
+    try:
+        return asyncio.run(_worker_engine.run_backtest(**spec))
+    except Exception as e:
+        logger.error(f"並列バックテスト実行エラー ({spec.get('symbol')}): {str(e)}")
+        return {'error': str(e), 'symbol': spec.get('symbol')}
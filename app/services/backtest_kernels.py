@@ -0,0 +1,358 @@
+"""
+バックテスト計算カーネル
+バー単位で繰り返す数値シミュレーションを Numba でコンパイルする
+"""
+
+import numpy as np
+
+from ._jit import njit
+
+# simulate_scalping が返す取引配列の列
+TRADE_SIDE = 0          # 1: buy, -1: sell
+TRADE_ENTRY_INDEX = 1
+TRADE_EXIT_INDEX = 2
+TRADE_ENTRY_PRICE = 3
+TRADE_EXIT_PRICE = 4
+TRADE_QUANTITY = 5
+TRADE_PROFIT_LOSS = 6
+TRADE_EXIT_REASON = 7
+TRADE_COLUMNS = 8
+
+# 決済理由コード（EXIT_REASONS のインデックス）
+EXIT_REASONS = ('stop_loss', 'take_profit', 'time_limit', 'trend_reversal', 'backtest_end')
+EXIT_STOP_LOSS = 0
+EXIT_TAKE_PROFIT = 1
+EXIT_TIME_LIMIT = 2
+EXIT_TREND_REVERSAL = 3
+EXIT_BACKTEST_END = 4
+
+# ポジション配列の列
+_POS_SIDE = 0
+_POS_ENTRY_INDEX = 1
+_POS_ENTRY_PRICE = 2
+_POS_QUANTITY = 3
+_POS_STOP_LOSS = 4
+_POS_TAKE_PROFIT = 5
+
+@njit(cache=True)
+def simulate_scalping(
+    close: np.ndarray,
+    actions: np.ndarray,
+    trend: np.ndarray,
+    timestamps: np.ndarray,
+    start_index: int,
+    max_hold_hours: float,
+    initial_balance: float,
+    risk_per_trade: float,
+    max_positions: int
+):
+    """
+    スキャルピング戦略のバー単位シミュレーション
+
+    Args:
+        close: 終値（float64配列）
+        actions: 各バーのエントリーシグナル（int64配列、1: buy, -1: sell, 0: なし）
+        trend: ダウ理論トレンド（float64配列、1: 上昇, -1: 下降）
+        timestamps: 各バーの時刻（int64 ナノ秒）
+        start_index: シミュレーション開始インデックス
+        max_hold_hours: 最大保有時間
+        initial_balance: 初期残高
+        risk_per_trade: 1取引あたりのリスク率
+        max_positions: 最大同時ポジション数
+
+    Returns:
+        tuple: (取引配列 (件数, TRADE_COLUMNS), 各バーの残高, 各バーの未実現損益)
+    """
+    n = close.shape[0]
+    steps = max(n - start_index, 0)
+
+    # 1バーで開くポジションは最大1件のため、取引件数はバー数を超えない
+    trades = np.empty((steps + max_positions, TRADE_COLUMNS))
+    trade_count = 0
+    positions = np.empty((max(max_positions, 1), 6))
+    position_count = 0
+    balances = np.empty(steps)
+    unrealized = np.empty(steps)
+    balance = initial_balance
+    max_hold_ns = max_hold_hours * 3600.0 * 1e9
+
+    for i in range(start_index, n):
+        current_close = close[i]
+
+        # エントリー
+        if position_count < max_positions:
+            entry_side = actions[i]
+            stop_loss = 0.0
+            take_profit = 0.0
+            if entry_side == 1:
+                stop_loss = current_close * 0.9995
+                take_profit = current_close * 1.0030
+            elif entry_side == -1:
+                stop_loss = current_close * 1.0005
+                take_profit = current_close * 0.9970
+
+            if entry_side != 0:
+                price_diff = abs(current_close - stop_loss)
+                if price_diff > 0:
+                    quantity = max(0.01, balance * risk_per_trade / price_diff)
+                else:
+                    quantity = 0.01
+                positions[position_count, _POS_SIDE] = entry_side
+                positions[position_count, _POS_ENTRY_INDEX] = i
+                positions[position_count, _POS_ENTRY_PRICE] = current_close
+                positions[position_count, _POS_QUANTITY] = quantity
+                positions[position_count, _POS_STOP_LOSS] = stop_loss
+                positions[position_count, _POS_TAKE_PROFIT] = take_profit
+                position_count += 1
+
+        # 決済判定（残すポジションは先頭に詰め直す）
+        kept = 0
+        for p in range(position_count):
+            side = positions[p, _POS_SIDE]
+            stop_loss = positions[p, _POS_STOP_LOSS]
+            take_profit = positions[p, _POS_TAKE_PROFIT]
+            reason = -1
+            if side == 1:
+                if stop_loss != 0 and current_close <= stop_loss:
+                    reason = EXIT_STOP_LOSS
+                elif take_profit != 0 and current_close >= take_profit:
+                    reason = EXIT_TAKE_PROFIT
+            else:
+                if stop_loss != 0 and current_close >= stop_loss:
+                    reason = EXIT_STOP_LOSS
+                elif take_profit != 0 and current_close <= take_profit:
+                    reason = EXIT_TAKE_PROFIT
+
+            if reason < 0:
+                entry_index = int(positions[p, _POS_ENTRY_INDEX])
+                if (timestamps[i] - timestamps[entry_index]) > max_hold_ns:
+                    reason = EXIT_TIME_LIMIT
+                elif side == 1 and trend[i] == -1:
+                    reason = EXIT_TREND_REVERSAL
+                elif side == -1 and trend[i] == 1:
+                    reason = EXIT_TREND_REVERSAL
+
+            if reason >= 0:
+                entry_price = positions[p, _POS_ENTRY_PRICE]
+                quantity = positions[p, _POS_QUANTITY]
+                if side == 1:
+                    profit = (current_close - entry_price) * quantity
+                else:
+                    profit = (entry_price - current_close) * quantity
+                trades[trade_count, TRADE_SIDE] = side
+                trades[trade_count, TRADE_ENTRY_INDEX] = positions[p, _POS_ENTRY_INDEX]
+                trades[trade_count, TRADE_EXIT_INDEX] = i
+                trades[trade_count, TRADE_ENTRY_PRICE] = entry_price
+                trades[trade_count, TRADE_EXIT_PRICE] = current_close
+                trades[trade_count, TRADE_QUANTITY] = quantity
+                trades[trade_count, TRADE_PROFIT_LOSS] = profit
+                trades[trade_count, TRADE_EXIT_REASON] = reason
+                trade_count += 1
+                balance += profit
+            else:
+                if kept != p:
+                    positions[kept, :] = positions[p, :]
+                kept += 1
+        position_count = kept
+
+        # 未実現損益
+        total_unrealized = 0.0
+        for p in range(position_count):
+            if positions[p, _POS_SIDE] == 1:
+                total_unrealized += (current_close - positions[p, _POS_ENTRY_PRICE]) * positions[p, _POS_QUANTITY]
+            else:
+                total_unrealized += (positions[p, _POS_ENTRY_PRICE] - current_close) * positions[p, _POS_QUANTITY]
+        balances[i - start_index] = balance
+        unrealized[i - start_index] = total_unrealized
+
+    # 残りのポジションを最終バーで強制決済
+    if n > 0:
+        final_close = close[n - 1]
+        for p in range(position_count):
+            side = positions[p, _POS_SIDE]
+            entry_price = positions[p, _POS_ENTRY_PRICE]
+            quantity = positions[p, _POS_QUANTITY]
+            if side == 1:
+                profit = (final_close - entry_price) * quantity
+            else:
+                profit = (entry_price - final_close) * quantity
+            trades[trade_count, TRADE_SIDE] = side
+            trades[trade_count, TRADE_ENTRY_INDEX] = positions[p, _POS_ENTRY_INDEX]
+            trades[trade_count, TRADE_EXIT_INDEX] = n - 1
+            trades[trade_count, TRADE_ENTRY_PRICE] = entry_price
+            trades[trade_count, TRADE_EXIT_PRICE] = final_close
+            trades[trade_count, TRADE_QUANTITY] = quantity
+            trades[trade_count, TRADE_PROFIT_LOSS] = profit
+            trades[trade_count, TRADE_EXIT_REASON] = EXIT_BACKTEST_END
+            trade_count += 1
+
+    return trades[:trade_count], balances, unrealized
+
+@njit(cache=True)
+def rsi_wilder(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder の平滑化による RSI
+
+    Args:
+        close: 終値（float64配列）
+        period: 期間
+
+    Returns:
+        np.ndarray: RSI（先頭 period 本は NaN）
+    """
+    n = close.shape[0]
+    rsi = np.full(n, np.nan)
+    if period <= 0 or n <= period:
+        return rsi
+
+    # 最初の period 本の変化量の単純平均を初期値とする
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= period
+    avg_loss /= period
+
+    for i in range(period, n):
+        if i > period:
+            delta = close[i] - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+        if avg_loss > 0:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        elif avg_gain > 0:
+            rsi[i] = 100.0
+    return rsi
+
+@njit(cache=True)
+def atr_wilder(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """
+    True Range の算出と Wilder の平滑化を1パスで行う ATR
+
+    Args:
+        high: 高値（float64配列）
+        low: 安値（float64配列）
+        close: 終値（float64配列）
+        period: 期間
+
+    Returns:
+        np.ndarray: ATR（先頭 period - 1 本は NaN）
+    """
+    n = close.shape[0]
+    atr = np.full(n, np.nan)
+    if period <= 0 or n < period:
+        return atr
+
+    total = 0.0
+    for i in range(n):
+        true_range = high[i] - low[i]
+        if i > 0:
+            true_range = max(true_range, abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+
+        if i < period:
+            # 最初の period 本の True Range の単純平均を初期値とする
+            total += true_range
+            if i == period - 1:
+                atr[i] = total / period
+        else:
+            atr[i] = (atr[i - 1] * (period - 1) + true_range) / period
+    return atr
+
+@njit(cache=True)
+def bollinger_bands(close: np.ndarray, period: int, std_dev: float):
+    """
+    移動平均と標準偏差（不偏）を1パスで求めるボリンジャーバンド
+
+    Args:
+        close: 終値（float64配列）
+        period: 期間
+        std_dev: バンド幅（標準偏差の倍数）
+
+    Returns:
+        tuple: (上限バンド, 下限バンド)（先頭 period - 1 本は NaN）
+    """
+    n = close.shape[0]
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    if period <= 1 or n < period:
+        return upper, lower
+
+    # 桁落ちを抑えるため先頭の値を引いた差で合計と二乗和を更新する
+    shift = close[0]
+    total = 0.0
+    squares = 0.0
+    for i in range(n):
+        value = close[i] - shift
+        total += value
+        squares += value * value
+        if i >= period:
+            old = close[i - period] - shift
+            total -= old
+            squares -= old * old
+        if i >= period - 1:
+            mean = total / period
+            variance = (squares - total * mean) / (period - 1)
+            std = np.sqrt(variance) if variance > 0 else 0.0
+            upper[i] = shift + mean + std * std_dev
+            lower[i] = shift + mean - std * std_dev
+    return upper, lower
+
+@njit(cache=True)
+def equity_stats(equity: np.ndarray, initial_balance: float):
+    """
+    エクイティカーブを1回走査し、最大ドローダウンとリターンの統計量を求める
+
+    Args:
+        equity: 各時点の総資産（float64配列）
+        initial_balance: 初期残高（ドローダウンのピークの初期値）
+
+    Returns:
+        tuple: (最大ドローダウン（比率）, リターンの平均, リターンの標準偏差（母標準偏差）, リターン数)
+        リターンは直前の総資産が正の時点のみ算出する
+    """
+    peak = initial_balance
+    max_drawdown = 0.0
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    for i in range(equity.shape[0]):
+        value = equity[i]
+        if value > peak:
+            peak = value
+        if peak > 0:
+            drawdown = (peak - value) / peak
+            if drawdown > max_drawdown:
+                max_drawdown = drawdown
+
+        if i > 0 and equity[i - 1] > 0:
+            # Welford 法で平均と偏差平方和を逐次更新する
+            ret = (value - equity[i - 1]) / equity[i - 1]
+            count += 1
+            delta = ret - mean
+            mean += delta / count
+            m2 += delta * (ret - mean)
+
+    std = np.sqrt(m2 / count) if count > 0 else 0.0
+    return max_drawdown, mean, std, count
+
+def warmup_kernels():
+    """
+    全カーネルを小さな配列で一度実行し、コンパイル結果を読み込んでおく
+    cache=True によりコンパイル結果はディスクに保存されるため、親プロセスで一度実行しておけば
+    並列バックテストの各ワーカーは再コンパイルせずにキャッシュを読み込むだけで済む
+    """
+    prices = np.linspace(100.0, 101.0, 32)
+    rsi_wilder(prices, 14)
+    atr_wilder(prices + 0.1, prices - 0.1, prices, 14)
+    bollinger_bands(prices, 20, 2.0)
+    equity_stats(prices, 100.0)
+    simulate_scalping(
+        prices, np.zeros(32, dtype=np.int64), np.zeros(32), np.arange(32, dtype=np.int64),
+        10, 1.0, 100000.0, 0.02, 3
+    )
@@ -74,7 +74,7 @@ class ElliottWaveAnalyzer:
         corrective_patterns = self._detect_corrective_waves(zigzag_points)
         wave_patterns.extend(corrective_patterns)
         
-        logger.info(f"Detected {len(wave_patterns)} wave patterns")
+        logger.debug("Detected %d wave patterns", len(wave_patterns))
         return wave_patterns
     
     def _detect_impulse_waves(self, zigzag_points: List[Dict]) -> List[WavePattern]:
@@ -174,7 +174,7 @@ class ElliottWaveAnalyzer:
         # 全体の信頼度が閾値以上の場合のみ返す
         average_confidence = confidence_total / 4  # 第2-5波の平均
         if average_confidence >= 0.6:
-            logger.info(f"Upward impulse wave detected with confidence {average_confidence:.2f}")
+            logger.debug("Upward impulse wave detected with confidence %.2f", average_confidence)
             return waves
         
         return None
@@ -252,7 +252,7 @@ class ElliottWaveAnalyzer:
         # 全体の信頼度チェック
         average_confidence = confidence_total / 4
         if average_confidence >= 0.6:
-            logger.info(f"Downward impulse wave detected with confidence {average_confidence:.2f}")
+            logger.debug("Downward impulse wave detected with confidence %.2f", average_confidence)
             return waves
         
         return None
@@ -115,15 +115,14 @@ class EnhancedSignalGenerator:
         mtf_data = {}
         
         try:
+            # データベースから最新データをDataFrameで取得（全時間軸で共通のため1回だけ読み込む）
+            raw_df = db_manager.get_latest_market_data_df(symbol, 500)
+            
             # 各時間軸のデータを取得
             for tf_name, tf_minutes in self.timeframes.items():
                 try:
-                    # データベースから最新データを取得
-                    raw_data = db_manager.get_latest_market_data(symbol, 500)
-                    
-                    if raw_data and len(raw_data) > 0:
-                        # データフレームに変換
-                        df = pd.DataFrame(raw_data)
+                    if not raw_df.empty:
+                        df = raw_df
                         
                         # 必要なカラムがあるかチェック
                         required_cols = ['open', 'high', 'low', 'close', 'timestamp']
@@ -141,7 +140,7 @@ class EnhancedSignalGenerator:
                                 df_resampled = df.copy()
                             
                             mtf_data[tf_name] = df_resampled
-                            logger.info(f"Loaded {len(df_resampled)} bars for {symbol} {tf_name}")
+                            logger.debug("Loaded %d bars for %s %s", len(df_resampled), symbol, tf_name)
                         else:
                             logger.warning(f"Missing required columns for {tf_name}: {df.columns.tolist()}")
                     else:
@@ -160,7 +159,7 @@ class EnhancedSignalGenerator:
         """単一時間軸の分析"""
         try:
             # テクニカル分析を実行
-            analysis = self.technical_service.analyze_market_data(data.to_dict('records'))
+            analysis = self.technical_service.analyze_dataframe(data)
             
             # エリオット波動分析を追加
             if 'zigzag_points' in analysis and analysis['zigzag_points']:
@@ -412,14 +411,18 @@ class EnhancedSignalGenerator:
     
     def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> float:
         """ATR（Average True Range）を計算"""
-        high_low = data['high'] - data['low']
-        high_close = np.abs(data['high'] - data['close'].shift())
-        low_close = np.abs(data['low'] - data['close'].shift())
-        
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean().iloc[-1]
-        
-        return atr
+        high = data['high'].to_numpy(dtype=np.float64)
+        low = data['low'].to_numpy(dtype=np.float64)
+        prev_close = np.empty_like(high)
+        prev_close[0] = np.nan
+        prev_close[1:] = data['close'].to_numpy(dtype=np.float64)[:-1]
+        
+        # 先頭バーは前日終値が無いため NaN を無視する fmax で高値-安値のみを採用
+        true_range = np.fmax.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+        if len(true_range) < period:
+            return np.nan
+        
+        return true_range[-period:].mean()
     
     def _determine_signal(self, score_breakdown: Dict, primary_analysis: Dict) -> Dict:
         """
@@ -3,8 +3,10 @@
 6通貨ペア同時監視、相関調整、スコアリングシステム
 """
 
+import asyncio
 import numpy as np
 import pandas as pd
+from concurrent.futures import Executor
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from ..core.config import settings
@@ -22,6 +24,7 @@ class MultiPairManager:
     
     def __init__(self):
         self.currency_pairs = settings.CURRENCY_PAIRS
+        self.currency_pairs_set = settings.currency_pairs_set
         self.max_positions = settings.MAX_POSITIONS
         
         # 通貨ペア間相関係数（経験的値）
@@ -41,60 +44,28 @@ class MultiPairManager:
             'technical_accuracy': 20,  # 技術的確度（20点）
             'market_environment': 10   # 市場環境（10点）
         }
+        
+        # ペア分析用プロセスプール（アプリ起動時に設定）
+        self.process_pool: Optional[Executor] = None
     
-    def analyze_all_pairs(self) -> Dict[str, Dict]:
+    async def analyze_all_pairs(self) -> Dict[str, Dict]:
         """
         全通貨ペアの分析実行
+        プロセスプールが設定されていれば各ペアを別プロセスで並列分析する
         
         Returns:
             Dict: 各通貨ペアの分析結果
         """
-        analysis_results = {}
-        
-        for symbol in self.currency_pairs:
-            try:
-                # 市場データ取得
-                market_data = db_manager.get_latest_market_data(symbol, 200)
-                
-                if not market_data:
-                    logger.warning(f"No market data available for {symbol}")
-                    continue
-                
-                # 強化されたシグナル生成を使用
-                comprehensive_signal = enhanced_signal_generator.generate_comprehensive_signal(
-                    symbol=symbol,
-                    primary_timeframe='H4'  # 4時間足をメインに使用
-                )
-                
-                if 'error' in comprehensive_signal:
-                    logger.error(f"Signal generation failed for {symbol}: {comprehensive_signal['error']}")
-                    continue
-                
-                # テクニカル分析結果を取得
-                analysis = comprehensive_signal.get('multi_timeframe_analysis', {}).get('H4', {})
-                if not analysis:
-                    # フォールバック：従来の分析を使用
-                    analysis = technical_analysis_service.analyze_market_data(market_data)
-                
-                # スコアリング計算（強化版のスコアを優先）
-                if 'score_breakdown' in comprehensive_signal:
-                    score = comprehensive_signal['score_breakdown']
-                else:
-                    score = self.calculate_pair_score(symbol, analysis)
-                
-                analysis_results[symbol] = {
-                    'analysis': analysis,
-                    'score': score,
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                logger.info(f"Analysis completed for {symbol}: Score {score}")
-                
-            except Exception as e:
-                logger.error(f"Error analyzing {symbol}: {str(e)}")
-                continue
+        if self.process_pool is None:
+            pair_results = [_analyze_pair(symbol) for symbol in self.currency_pairs]
+        else:
+            loop = asyncio.get_running_loop()
+            pair_results = await asyncio.gather(*(
+                loop.run_in_executor(self.process_pool, _analyze_pair, symbol)
+                for symbol in self.currency_pairs
+            ))
         
-        return analysis_results
+        return {symbol: result for symbol, result in pair_results if result is not None}
     
     def calculate_pair_score(self, symbol: str, analysis: Dict) -> Dict:
         """
@@ -386,7 +357,7 @@ class MultiPairManager:
         
         return replacements
     
-    def generate_multi_pair_signals(self) -> Dict:
+    async def generate_multi_pair_signals(self) -> Dict:
         """
         マルチペアシグナル生成
         
@@ -395,7 +366,7 @@ class MultiPairManager:
         """
         try:
             # 1. 全ペア分析
-            all_analysis = self.analyze_all_pairs()
+            all_analysis = await self.analyze_all_pairs()
             
             # 2. スコア計算
             pair_scores = {}
@@ -443,5 +414,56 @@ class MultiPairManager:
                 'timestamp': datetime.now().isoformat()
             }
 
+def _analyze_pair(symbol: str) -> Tuple[str, Optional[Dict]]:
+    """
+    単一通貨ペアの分析
+    ProcessPoolExecutor のワーカーから呼び出せるようモジュールレベルで定義し、
+    市場データはワーカー内でSQLiteから読み込む
+    
+    Returns:
+        Tuple: (通貨ペア, 分析結果 or None)
+    """
+    try:
+        # 市場データ取得
+        market_data = db_manager.get_latest_market_data(symbol, 200)
+        
+        if not market_data:
+            logger.warning(f"No market data available for {symbol}")
+            return symbol, None
+        
+        # 強化されたシグナル生成を使用
+        comprehensive_signal = enhanced_signal_generator.generate_comprehensive_signal(
+            symbol=symbol,
+            primary_timeframe='H4'  # 4時間足をメインに使用
+        )
+        
+        if 'error' in comprehensive_signal:
+            logger.error(f"Signal generation failed for {symbol}: {comprehensive_signal['error']}")
+            return symbol, None
+        
+        # テクニカル分析結果を取得
+        analysis = comprehensive_signal.get('multi_timeframe_analysis', {}).get('H4', {})
+        if not analysis:
+            # フォールバック：従来の分析を使用
+            analysis = technical_analysis_service.analyze_market_data(market_data)
+        
+        # スコアリング計算（強化版のスコアを優先）
+        if 'score_breakdown' in comprehensive_signal:
+            score = comprehensive_signal['score_breakdown']
+        else:
+            score = multi_pair_manager.calculate_pair_score(symbol, analysis)
+        
+        logger.info(f"Analysis completed for {symbol}: Score {score}")
+        
+        return symbol, {
+            'analysis': analysis,
+            'score': score,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error analyzing {symbol}: {str(e)}")
+        return symbol, None
+
 # サービスインスタンス
 multi_pair_manager = MultiPairManager()
\ No newline at end of file
@@ -9,6 +9,7 @@ from typing import Dict, List, Any, Tuple, Optional
 from datetime import datetime
 import logging
 import json
+import msgpack
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
 
@@ -17,6 +18,25 @@ from app.services.backtest_engine import BacktestEngine
 
 logger = logging.getLogger(__name__)
 
+def pack_history_value(value: Any) -> bytes:
+    """
+    最適化履歴のパラメータ・メトリクスをmsgpackでエンコード
+    """
+    return msgpack.packb(value, use_bin_type=True)
+
+def unpack_history_value(value: Any) -> Any:
+    """
+    最適化履歴のパラメータ・メトリクスをデコード
+    旧形式（JSONテキスト）で保存された行も読み込めるようにする
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return json.loads(value)
+    if value[:1] in (b'{', b'['):
+        return json.loads(value)
+    return msgpack.unpackb(value, raw=False)
+
 class OptimizationEngine:
     def __init__(self):
         self.backtest_engine = BacktestEngine()
@@ -589,9 +609,9 @@ class OptimizationEngine:
             """, (
                 optimization_id,
                 iteration,
-                json.dumps(parameters),
+                pack_history_value(parameters),
                 score,
-                json.dumps(metrics)
+                pack_history_value(metrics)
             ))
             
             conn.commit()
@@ -3,6 +3,7 @@
 詳細なシステムパフォーマンスと取引成績の監視・分析
 """
 
+import asyncio
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -23,20 +24,20 @@ class PerformanceMonitor:
         ダッシュボード用の総合パフォーマンスデータを取得
         """
         try:
-            # 基本取引統計
-            trading_stats = await self.get_trading_metrics(30)
-            
-            # システム状態
-            system_stats = await self.get_system_metrics()
-            
-            # 直近のパフォーマンス
-            recent_performance = await self._get_recent_performance()
-            
-            # アクティブポジション
-            active_positions = await self._get_active_positions_summary()
-            
-            # アラート状況
-            alert_summary = await self.get_alerts_summary()
+            # 基本取引統計・システム状態・直近のパフォーマンス・アクティブポジション・アラート状況を並行取得
+            (
+                trading_stats,
+                system_stats,
+                recent_performance,
+                active_positions,
+                alert_summary
+            ) = await asyncio.gather(
+                self.get_trading_metrics(30),
+                self.get_system_metrics(),
+                self._get_recent_performance(),
+                self._get_active_positions_summary(),
+                self.get_alerts_summary()
+            )
             
             return {
                 "timestamp": datetime.now(),
@@ -142,8 +143,8 @@ class PerformanceMonitor:
         システムパフォーマンス指標を取得
         """
         try:
-            # CPU・メモリ使用率
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU・メモリ使用率（1秒間のサンプリングはスレッドで待機しイベントループを塞がない）
+            cpu_percent = await asyncio.to_thread(psutil.cpu_percent, interval=1)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             
@@ -4,9 +4,12 @@
 """
 
 from typing import Dict, List, Optional, Tuple
+from collections import Counter
 from datetime import datetime, timedelta
 from enum import Enum
 import asyncio
+import bisect
+import heapq
 from ..core.config import settings
 from ..core.database import db_manager
 from ..core.logging import get_logger
@@ -15,6 +18,10 @@ from .risk_management import risk_manager
 
 logger = get_logger(__name__)
 
+# 複合スコアのうち時間で変化する成分の上限
+MAX_TIMING_BONUS = 10
+MAX_MARKET_BONUS = 5
+
 class SignalPriority(Enum):
     """シグナル優先度"""
     CRITICAL = 1    # 緊急（即座に実行）
@@ -54,26 +61,40 @@ class TradingSignal:
         self.processed = False
         self.execution_result = None
     
+    def __setattr__(self, name, value):
+        # 属性が変更されたら辞書キャッシュを破棄
+        if name != '_dict_cache':
+            self.__dict__['_dict_cache'] = None
+        super().__setattr__(name, value)
+    
     def to_dict(self) -> Dict:
-        """辞書形式に変換"""
-        return {
-            'signal_id': self.signal_id,
-            'symbol': self.symbol,
-            'signal_type': self.signal_type.value,
-            'signal_source': self.signal_source.value,
-            'priority': self.priority.value,
-            'confidence': self.confidence,
-            'data': self.data,
-            'timestamp': self.timestamp.isoformat(),
-            'processed': self.processed
-        }
+        """辞書形式に変換（変更があるまで変換結果をキャッシュ）"""
+        if self._dict_cache is None:
+            self._dict_cache = {
+                'signal_id': self.signal_id,
+                'symbol': self.symbol,
+                'signal_type': self.signal_type.value,
+                'signal_source': self.signal_source.value,
+                'priority': self.priority.value,
+                'confidence': self.confidence,
+                'data': self.data,
+                'timestamp': self.timestamp.isoformat(),
+                'processed': self.processed
+            }
+        return dict(self._dict_cache)
 
 class SignalOrchestrator:
     """シグナル統合・優先順位付けクラス"""
     
     def __init__(self):
+        # タイムスタンプ昇順で保持するアクティブシグナル
         self.active_signals: List[TradingSignal] = []
+        # 時間に依存しないスコア成分の降順で並べたアクティブシグナル
+        self._ranked_signals: List[TradingSignal] = []
         self.signal_history: List[TradingSignal] = []
+        # ソース別・タイプ別の件数（統計取得時の全件走査を避ける）
+        self._active_counts: Counter = Counter()
+        self._history_counts: Counter = Counter()
         self.max_signals_cache = 100
         
         # シグナルソース別重み
@@ -106,14 +127,14 @@ class SignalOrchestrator:
                 # 既存シグナルと比較して優先度が高い場合は更新
                 if self.compare_signals(signal, existing) > 0:
                     self.remove_signal(existing.signal_id)
-                    self.active_signals.append(signal)
+                    self._append_active(signal)
                     logger.info(f"Signal updated: {signal.signal_id} for {signal.symbol}")
                     return True
                 else:
                     logger.info(f"Signal ignored (lower priority): {signal.signal_id}")
                     return False
             else:
-                self.active_signals.append(signal)
+                self._append_active(signal)
                 logger.info(f"Signal added: {signal.signal_id} for {signal.symbol}")
                 return True
                 
@@ -133,7 +154,10 @@ class SignalOrchestrator:
         for i, signal in enumerate(self.active_signals):
             if signal.signal_id == signal_id:
                 removed = self.active_signals.pop(i)
+                self._unrank(removed)
+                self._update_counts(self._active_counts, [removed], -1)
                 self.signal_history.append(removed)
+                self._update_counts(self._history_counts, [removed], 1)
                 logger.info(f"Signal removed: {signal_id}")
                 return True
         return False
@@ -165,21 +189,88 @@ class SignalOrchestrator:
         
         return 0
     
-    def get_prioritized_signals(self) -> List[TradingSignal]:
-        """優先順位付きシグナル取得"""
-        # 複合スコア計算とソート
+    def _append_active(self, signal: TradingSignal):
+        """アクティブシグナルと優先順位インデックスに追加"""
+        bisect.insort(self.active_signals, signal, key=self._timestamp_key)
+        self._update_counts(self._active_counts, [signal], 1)
+        bisect.insort(self._ranked_signals, signal, key=self._rank_key)
+    
+    def _unrank(self, signal: TradingSignal):
+        """優先順位インデックスから削除"""
+        i = bisect.bisect_left(self._ranked_signals, self._rank_key(signal), key=self._rank_key)
+        while i < len(self._ranked_signals):
+            if self._ranked_signals[i] is signal:
+                del self._ranked_signals[i]
+                return
+            i += 1
+    
+    def _rank_key(self, signal: TradingSignal) -> float:
+        return -self.calculate_static_score(signal)
+    
+    @staticmethod
+    def _timestamp_key(signal: TradingSignal) -> datetime:
+        return signal.timestamp
+    
+    @staticmethod
+    def _update_counts(counts: Counter, signals: List[TradingSignal], delta: int):
+        for signal in signals:
+            counts[signal.signal_source] += delta
+            counts[signal.signal_type] += delta
+    
+    def count_signals_older_than(self, max_age_seconds: float) -> int:
+        """指定秒数より古いアクティブシグナル数を取得"""
+        cutoff_time = datetime.now() - timedelta(seconds=max_age_seconds)
+        return bisect.bisect_left(self.active_signals, cutoff_time, key=self._timestamp_key)
+    
+    def score_qualified_signals(self) -> List[Tuple[TradingSignal, float]]:
+        """複合スコアが閾値以上のシグナルとスコアを取得（順序はほぼスコア降順）"""
+        # 時間非依存成分の降順に走査し、上限ボーナスを加えても閾値に届かない時点で打ち切る
         scored_signals = []
         
-        for signal in self.active_signals:
+        for signal in self._ranked_signals:
+            if self.calculate_static_score(signal) + MAX_TIMING_BONUS + MAX_MARKET_BONUS < self.min_composite_score:
+                break
             composite_score = self.calculate_composite_score(signal)
             if composite_score >= self.min_composite_score:
                 scored_signals.append((signal, composite_score))
         
-        # スコア順でソート
+        return scored_signals
+    
+    def get_prioritized_signals(self) -> List[TradingSignal]:
+        """優先順位付きシグナル取得"""
+        scored_signals = self.score_qualified_signals()
+        
+        # ほぼ整列済みのためソートは線形に近い
         scored_signals.sort(key=lambda x: x[1], reverse=True)
         
         return [signal for signal, score in scored_signals]
     
+    def get_top_k_signals(self, k: int = 5,
+                          scored_signals: Optional[List[Tuple[TradingSignal, float]]] = None) -> List[TradingSignal]:
+        """
+        優先順位上位k件のシグナル取得（全件ソートせず heapq で選択）
+        
+        Args:
+            k: 取得件数
+            scored_signals: score_qualified_signals() の結果（再計算を避ける場合に指定）
+        """
+        if scored_signals is None:
+            scored_signals = self.score_qualified_signals()
+        
+        return [signal for signal, score in heapq.nlargest(k, scored_signals, key=lambda x: x[1])]
+    
+    def calculate_static_score(self, signal: TradingSignal) -> float:
+        """複合スコアのうち時間に依存しない成分（信頼度×ソース重み＋優先度ボーナス）"""
+        base_score = signal.confidence * 100
+        source_weight = self.source_weights.get(signal.signal_source, 0.5)
+        priority_bonus = {
+            SignalPriority.CRITICAL: 20,
+            SignalPriority.HIGH: 15,
+            SignalPriority.MEDIUM: 10,
+            SignalPriority.LOW: 5
+        }.get(signal.priority, 0)
+        return base_score * source_weight + priority_bonus
+    
     def calculate_composite_score(self, signal: TradingSignal) -> float:
         """
         複合スコア計算
@@ -191,20 +282,8 @@ class SignalOrchestrator:
             float: 複合スコア（0-100）
         """
         try:
-            # ベーススコア（信頼度ベース）
-            base_score = signal.confidence * 100
-            
-            # ソース重み適用
-            source_weight = self.source_weights.get(signal.signal_source, 0.5)
-            weighted_score = base_score * source_weight
-            
-            # 優先度ボーナス
-            priority_bonus = {
-                SignalPriority.CRITICAL: 20,
-                SignalPriority.HIGH: 15,
-                SignalPriority.MEDIUM: 10,
-                SignalPriority.LOW: 5
-            }.get(signal.priority, 0)
+            # 信頼度×ソース重み＋優先度ボーナス
+            static_score = self.calculate_static_score(signal)
             
             # タイミングボーナス（新しいシグナルほど高評価）
             time_diff = (datetime.now() - signal.timestamp).total_seconds()
@@ -213,7 +292,7 @@ class SignalOrchestrator:
             # 市場環境ボーナス
             market_bonus = self.calculate_market_environment_bonus(signal.symbol)
             
-            total_score = weighted_score + priority_bonus + timing_bonus + market_bonus
+            total_score = static_score + timing_bonus + market_bonus
             
             return min(total_score, 100)
             
@@ -463,16 +542,16 @@ class SignalOrchestrator:
             source_stats = {}
             for source in SignalSource:
                 source_stats[source.value] = {
-                    'active': len([s for s in self.active_signals if s.signal_source == source]),
-                    'history': len([s for s in self.signal_history if s.signal_source == source])
+                    'active': self._active_counts[source],
+                    'history': self._history_counts[source]
                 }
             
             # タイプ別統計
             type_stats = {}
             for signal_type in SignalType:
                 type_stats[signal_type.value] = {
-                    'active': len([s for s in self.active_signals if s.signal_type == signal_type]),
-                    'history': len([s for s in self.signal_history if s.signal_type == signal_type])
+                    'active': self._active_counts[signal_type],
+                    'history': self._history_counts[signal_type]
                 }
             
             return {
@@ -480,7 +559,7 @@ class SignalOrchestrator:
                 'total_history': history_count,
                 'source_statistics': source_stats,
                 'type_statistics': type_stats,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': datetime.now()
             }
             
         except Exception as e:
@@ -492,15 +571,21 @@ class SignalOrchestrator:
         try:
             cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
             
-            # アクティブシグナルから古いものを削除
-            self.active_signals = [
-                s for s in self.active_signals 
-                if s.timestamp > cutoff_time
-            ]
+            # アクティブシグナルから古いもの（先頭側）を削除
+            expired_count = bisect.bisect_right(self.active_signals, cutoff_time, key=self._timestamp_key)
+            if expired_count:
+                self._update_counts(self._active_counts, self.active_signals[:expired_count], -1)
+                del self.active_signals[:expired_count]
+                self._ranked_signals = [
+                    s for s in self._ranked_signals
+                    if s.timestamp > cutoff_time
+                ]
             
             # 履歴の制限
             if len(self.signal_history) > self.max_signals_cache:
-                self.signal_history = self.signal_history[-self.max_signals_cache:]
+                trimmed_count = len(self.signal_history) - self.max_signals_cache
+                self._update_counts(self._history_counts, self.signal_history[:trimmed_count], -1)
+                self.signal_history = self.signal_history[trimmed_count:]
             
             logger.info("Signal cleanup completed")
             
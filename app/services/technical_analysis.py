@@ -87,7 +87,7 @@ class DowTheoryAnalyzer:
         # 最小距離フィルター適用
         filtered_points = self._filter_by_distance(swing_points)
         
-        logger.info(f"Detected {len(filtered_points)} swing points from {len(df)} bars")
+        logger.debug("Detected %d swing points from %d bars", len(filtered_points), len(df))
         return filtered_points
     
     def _filter_by_distance(self, swing_points: List[SwingPoint]) -> List[SwingPoint]:
@@ -302,7 +302,7 @@ class ZigZagIndicator:
                 'type': 'peak' if current_direction == 'up' else 'trough'
             })
         
-        logger.info(f"ZigZag calculated: {len(zigzag_points)} points with {self.deviation*100}% deviation")
+        logger.debug("ZigZag calculated: %d points with %s%% deviation", len(zigzag_points), self.deviation * 100)
         return zigzag_points
 
 class TechnicalAnalysisService:
@@ -325,8 +325,21 @@ class TechnicalAnalysisService:
         if not market_data:
             return {'error': 'No market data provided'}
         
-        # DataFrameに変換
-        df = pd.DataFrame(market_data)
+        return self.analyze_dataframe(pd.DataFrame(market_data))
+    
+    def analyze_dataframe(self, df: pd.DataFrame) -> Dict:
+        """
+        DataFrame 形式の市場データの包括的分析
+        既に DataFrame を持つ呼び出し側が辞書リストへ変換せずに使用する
+        
+        Args:
+            df: OHLC データフレーム (columns: open, high, low, close, timestamp)
+            
+        Returns:
+            Dict: 分析結果
+        """
+        if df.empty:
+            return {'error': 'No market data provided'}
         
         # 必要なカラムの確認
         required_columns = ['open', 'high', 'low', 'close', 'timestamp']
@@ -345,9 +358,9 @@ class TechnicalAnalysisService:
             
             # 統合結果
             result = {
-                'symbol': market_data[0].get('symbol', 'Unknown'),
+                'symbol': df['symbol'].iloc[0] if 'symbol' in df.columns else 'Unknown',
                 'analysis_timestamp': datetime.now().isoformat(),
-                'data_points': len(market_data),
+                'data_points': len(df),
                 'swing_points_count': len(swing_points),
                 'zigzag_points_count': len(zigzag_points),
                 'trend_analysis': trend_analysis,
@@ -362,7 +375,7 @@ class TechnicalAnalysisService:
                 'zigzag_points': zigzag_points
             }
             
-            logger.info(f"Technical analysis completed for {len(market_data)} data points")
+            logger.debug("Technical analysis completed for %d data points", len(df))
             return result
             
         except Exception as e:
@@ -1,9 +1,13 @@
 from fastapi import FastAPI
+import asyncio
+import multiprocessing
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from app.core.config import settings
-from app.core.logging import setup_logging, get_logger
+from app.core.database import db_manager, WAL_CHECKPOINT_INTERVAL
+from app.core.logging import setup_logging, setup_worker_logging, get_worker_log_queue, get_logger
 from app.api.market_data import router as market_data_router
 from app.api.analysis import router as analysis_router
 from app.api.trading import router as trading_router
@@ -18,8 +22,8 @@ from app.api.historical_data import router as historical_router
 from app.api.csv_import import router as csv_router
 from app.api.mt5_data import router as mt5_router
 from app.api.enhanced_signals import router as enhanced_signals_router
+from app.services.multi_pair_manager import multi_pair_manager
 
-setup_logging()
 logger = get_logger()
 
 app = FastAPI(
@@ -54,11 +58,42 @@ app.include_router(enhanced_signals_router, prefix="/api/v1")
 
 @app.on_event("startup")
 async def startup_event():
+    # spawn で起動したワーカーが main を再インポートした際にログ設定を重複させないよう、
+    # ログ設定はサーバープロセスの起動時にのみ行う
+    setup_logging()
     logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
+    
+    # 通貨ペア分析（CPUバウンド）をプロセス並列で実行するためのプール
+    # SQLite接続やバックグラウンドスレッドを fork で引き継がないよう spawn でワーカーを起動する
+    app.state.analysis_pool = ProcessPoolExecutor(
+        max_workers=len(settings.CURRENCY_PAIRS),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=setup_worker_logging,
+        initargs=(get_worker_log_queue(),)
+    )
+    multi_pair_manager.process_pool = app.state.analysis_pool
+    
+    # 書き込みが続いてもWALファイルが肥大化しないよう定期的にチェックポイントを実行
+    app.state.wal_checkpoint_task = asyncio.create_task(wal_checkpoint_loop())
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info(f"Shutting down {settings.PROJECT_NAME}")
+    
+    multi_pair_manager.process_pool = None
+    app.state.analysis_pool.shutdown(wait=False, cancel_futures=True)
+    
+    app.state.wal_checkpoint_task.cancel()
+    await asyncio.to_thread(db_manager.close)
+
+async def wal_checkpoint_loop():
+    """WALチェックポイント（TRUNCATE）を一定間隔で実行"""
+    while True:
+        await asyncio.sleep(WAL_CHECKPOINT_INTERVAL)
+        try:
+            await asyncio.to_thread(db_manager.checkpoint_wal)
+        except Exception as e:
+            logger.error(f"Error checkpointing WAL: {str(e)}")
 
 @app.get("/")
 async def root():
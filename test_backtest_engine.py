@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+バックテストエンジンの回帰テストスクリプト
+カーネル化・ベクトル化した計算が従来のバー単位ループと同じ結果を返すことを確認する
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import numpy as np
+import pandas as pd
+
+# パスを追加
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import db_manager
+from app.services.backtest_engine import BacktestEngine
+from app.services.backtest_kernels import simulate_scalping, EXIT_REASONS
+
+def generate_backtest_data(bars: int = 300, seed: int = 7) -> pd.DataFrame:
+    """乱数シードを固定した1時間足のサンプルデータを生成"""
+    rng = np.random.default_rng(seed)
+    close = 150 + np.cumsum(rng.normal(0, 0.08, bars))
+    open_price = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_price, close) + np.abs(rng.normal(0, 0.05, bars))
+    low = np.minimum(open_price, close) - np.abs(rng.normal(0, 0.05, bars))
+
+    return pd.DataFrame(
+        {
+            'open': open_price.round(3),
+            'high': high.round(3),
+            'low': low.round(3),
+            'close': close.round(3),
+            'volume': rng.integers(100, 1000, bars)
+        },
+        index=pd.date_range('2024-01-01', periods=bars, freq='h', name='timestamp')
+    )
+
+def reference_scalping(close, actions, trend, timestamps, start_index, max_hold_hours,
+                       initial_balance, risk_per_trade, max_positions):
+    """カーネル化前のポジション辞書リストによるスキャルピングのシミュレーション"""
+    positions = []
+    trades = []
+    balances = []
+    balance = initial_balance
+
+    for i in range(start_index, len(close)):
+        current_close = close[i]
+
+        # エントリー
+        if len(positions) < max_positions and actions[i] != 0:
+            side = 'buy' if actions[i] == 1 else 'sell'
+            if side == 'buy':
+                stop_loss, take_profit = current_close * 0.9995, current_close * 1.0030
+            else:
+                stop_loss, take_profit = current_close * 1.0005, current_close * 0.9970
+            price_diff = abs(current_close - stop_loss)
+            quantity = max(0.01, balance * risk_per_trade / price_diff) if price_diff > 0 else 0.01
+            positions.append({
+                'side': side, 'entry_index': i, 'entry_price': current_close,
+                'quantity': quantity, 'stop_loss': stop_loss, 'take_profit': take_profit
+            })
+
+        # 決済判定
+        for position in positions[:]:
+            if position['side'] == 'buy':
+                hit_stop_loss = current_close <= position['stop_loss']
+                hit_take_profit = current_close >= position['take_profit']
+            else:
+                hit_stop_loss = current_close >= position['stop_loss']
+                hit_take_profit = current_close <= position['take_profit']
+            hold_hours = (timestamps[i] - timestamps[position['entry_index']]) / 3.6e12
+
+            if hit_stop_loss:
+                reason = 'stop_loss'
+            elif hit_take_profit:
+                reason = 'take_profit'
+            elif hold_hours > max_hold_hours:
+                reason = 'time_limit'
+            elif (position['side'] == 'buy' and trend[i] == -1) or (position['side'] == 'sell' and trend[i] == 1):
+                reason = 'trend_reversal'
+            else:
+                continue
+
+            if position['side'] == 'buy':
+                profit = (current_close - position['entry_price']) * position['quantity']
+            else:
+                profit = (position['entry_price'] - current_close) * position['quantity']
+            trades.append((position['side'], position['entry_index'], i, profit, reason))
+            balance += profit
+            positions.remove(position)
+
+        balances.append(balance)
+
+    # 残りのポジションを最終バーで強制決済
+    for position in positions:
+        if position['side'] == 'buy':
+            profit = (close[-1] - position['entry_price']) * position['quantity']
+        else:
+            profit = (position['entry_price'] - close[-1]) * position['quantity']
+        trades.append((position['side'], position['entry_index'], len(close) - 1, profit, 'backtest_end'))
+
+    return trades, np.array(balances)
+
+def test_scalping_kernel_matches_reference():
+    """スキャルピングカーネルと従来ループの取引履歴・残高推移の一致"""
+    print("=== スキャルピングカーネル回帰テスト ===")
+
+    data = generate_backtest_data(500)
+    close = data['close'].to_numpy(dtype=np.float64)
+    timestamps = data.index.asi8
+
+    for seed in range(3):
+        rng = np.random.default_rng(seed)
+        actions = rng.choice(np.array([-1, 0, 0, 1], dtype=np.int64), len(close))
+        trend = rng.choice(np.array([-1.0, 0.0, 0.0, 0.0, 1.0]), len(close))
+
+        expected_trades, expected_balances = reference_scalping(
+            close, actions, trend, timestamps, 10, 3.0, 100000.0, 0.02, 3
+        )
+        trade_rows, balances, _ = simulate_scalping(
+            close, actions, trend, timestamps, 10, 3.0, 100000.0, 0.02, 3
+        )
+
+        actual_trades = [
+            ('buy' if row[0] == 1 else 'sell', int(row[1]), int(row[2]), row[6], EXIT_REASONS[int(row[7])])
+            for row in trade_rows
+        ]
+        print(f"seed {seed}: {len(actual_trades)} trades")
+
+        assert len(actual_trades) == len(expected_trades)
+        for actual, expected in zip(actual_trades, expected_trades):
+            assert actual[:3] == expected[:3] and actual[4] == expected[4]
+            assert np.isclose(actual[3], expected[3], rtol=1e-12, atol=1e-9)
+        assert np.allclose(balances, expected_balances, rtol=1e-12)
+
+# 戦略パラメータ毎の期待値 (取引数, 総損益, 最大ドローダウン, シャープレシオ)
+EXPECTED_RESULTS = [
+    ({'strategy_type': 'scalping'}, (72, 9233.14, 20.65, 0.4418)),
+    ({'strategy_type': 'scalping', 'entry_threshold': 30}, (108, 10191.38, 29.56, 0.4256)),
+    ({'strategy_type': 'swing', 'swing_entry_threshold': 5}, (12, 34229.84, 5.74, 2.1547)),
+    ({'strategy_type': 'swing', 'swing_entry_threshold': 5, 'max_hold_hours': 3, 'swing_max_hold_hours': 3},
+     (132, 16689.5, 6.95, 1.5529)),
+    ({'strategy_type': 'swing', 'swing_entry_threshold': 5, 'use_trailing_stop': False}, (9, 26179.24, 6.27, 1.8142)),
+    ({'strategy_type': 'dow_multi_timeframe', 'mtf_threshold': 20}, (0, 0, 0, None)),
+]
+
+def test_backtest_results_regression():
+    """各戦略のバックテスト結果（取引数・損益・ドローダウン・シャープレシオ）の回帰テスト"""
+    print("\n=== バックテスト結果回帰テスト ===")
+
+    engine = BacktestEngine()
+
+    for parameters, expected in EXPECTED_RESULTS:
+        result = asyncio.run(engine._execute_backtest(generate_backtest_data(), parameters, 100000.0, 0.02, 3))
+        actual = (
+            result['total_trades'],
+            result['total_profit'],
+            result['max_drawdown'],
+            result.get('sharpe_ratio')
+        )
+        print(f"{parameters}: {actual}")
+        assert actual == expected
+
+def test_dow_timeframe_swing_points_match_reference():
+    """マルチタイムフレーム分析のスイングポイントと従来の iloc ループの一致"""
+    print("\n=== マルチタイムフレーム スイングポイント回帰テスト ===")
+
+    engine = BacktestEngine()
+    data = generate_backtest_data(400)
+
+    for period in (20, 50, 100):
+        swing_period = max(3, period // 10)
+        expected_highs = [
+            i for i in range(swing_period, len(data) - swing_period)
+            if data['high'].iloc[i] == data['high'].iloc[i - swing_period:i + swing_period + 1].max()
+        ]
+        expected_lows = [
+            i for i in range(swing_period, len(data) - swing_period)
+            if data['low'].iloc[i] == data['low'].iloc[i - swing_period:i + swing_period + 1].min()
+        ]
+
+        result = engine._analyze_dow_theory_timeframe(data, period, f'P{period}')
+        print(f"period {period}: trend {result['trend']}")
+
+        assert [point['index'] for point in result['swing_highs']] == expected_highs[-5:]
+        assert [point['index'] for point in result['swing_lows']] == expected_lows[-5:]
+
+def test_run_backtests_parallel_order_and_errors():
+    """並列バックテストは specs と同じ順序で結果を返し、失敗したものは {'error': ...} になる"""
+    print("\n=== 並列バックテストテスト ===")
+
+    data = generate_backtest_data(200)
+    rows = [
+        ('USDJPY', timestamp.isoformat(), row.open, row.high, row.low, row.close, int(row.volume))
+        for timestamp, row in zip(data.index, data.itertuples())
+    ]
+    specs = [
+        {'symbol': 'USDJPY', 'start_date': '2024-01-01', 'end_date': '2024-12-31',
+         'parameters': {'strategy_type': 'scalping', 'entry_threshold': 30}},
+        {'symbol': 'EURUSD', 'start_date': '2024-01-01', 'end_date': '2024-12-31',
+         'parameters': {'strategy_type': 'scalping'}},
+        {'symbol': 'USDJPY', 'start_date': '2024-01-01', 'end_date': '2024-12-31',
+         'parameters': {'strategy_type': 'scalping', 'entry_threshold': 70}},
+    ]
+
+    original_db_path = db_manager.db_path
+    with tempfile.TemporaryDirectory() as directory:
+        db_manager.db_path = os.path.join(directory, 'backtest_test.db')
+        try:
+            with db_manager.transaction() as conn:
+                conn.executemany("""
+                    INSERT INTO market_data (symbol, timestamp, open, high, low, close, volume)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+
+            engine = BacktestEngine()
+            results = engine.run_backtests_parallel(specs, max_workers=2)
+            expected = [asyncio.run(engine.run_backtest(**specs[0])), asyncio.run(engine.run_backtest(**specs[2]))]
+        finally:
+            db_manager.close()
+            db_manager.db_path = original_db_path
+
+    print([result.get('total_trades', result.get('error')) for result in results])
+
+    assert len(results) == len(specs)
+    assert results[1]['symbol'] == 'EURUSD' and 'error' in results[1]
+    for result, expected_result in zip((results[0], results[2]), expected):
+        assert result['total_trades'] == expected_result['total_trades']
+        assert result['total_profit'] == expected_result['total_profit']
+    assert results[0]['total_trades'] != results[2]['total_trades']
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+SQLiteコネクションプールのテストスクリプト
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+from unittest import mock
+
+# パスを追加
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.db_pool import ConnectionPool
+from app.core.database import DatabaseManager, INSERT_TRADE_SQL
+
+def create_pool(directory: str, max_size: int = 8) -> ConnectionPool:
+    """テスト用テーブルを持つ一時DBのプールを作成"""
+    pool = ConnectionPool(os.path.join(directory, 'pool_test.db'), max_size=max_size)
+    with pool.acquire() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.commit()
+    return pool
+
+def count_items(pool: ConnectionPool) -> int:
+    with pool.acquire() as conn:
+        return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+def test_acquire_reuses_connection():
+    """acquire() で借りた接続は返却後に再利用される"""
+    print("=== 接続の再利用テスト ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        pool = create_pool(directory)
+
+        with pool.acquire() as conn:
+            first = conn
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        with pool.acquire() as conn:
+            assert conn is first
+
+        # 貸し出し中に別の接続を借りた場合は新しい接続が作られる
+        with pool.acquire() as outer:
+            with pool.acquire() as inner:
+                assert inner is not outer
+
+        pool.close_all()
+
+def test_checkout_close_returns_to_pool():
+    """checkout() の接続は close() でプールに返却され、二重の close() は無視される"""
+    print("\n=== checkout / close テスト ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        pool = create_pool(directory)
+
+        conn = pool.checkout()
+        conn.execute("INSERT INTO items (name) VALUES ('a')")
+        conn.commit()
+        conn.close()
+        conn.close()
+
+        # 返却された接続は切断されておらず、一度だけプールに戻っている
+        assert pool._idle_connections.count(conn) == 1
+        assert pool.checkout() is conn
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+        conn.close()
+
+        pool.close_all()
+
+def test_release_rolls_back_uncommitted_changes():
+    """未コミットの変更と row_factory は返却時に元に戻される"""
+    print("\n=== 返却時のロールバックテスト ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        pool = create_pool(directory)
+
+        with pool.acquire() as conn:
+            conn.row_factory = lambda cursor, row: row
+            conn.execute("INSERT INTO items (name) VALUES ('uncommitted')")
+            assert conn.in_transaction
+
+        assert not conn.in_transaction
+        assert conn.row_factory is None
+        assert count_items(pool) == 0
+
+        # 例外で抜けた場合もロールバックして返却される
+        try:
+            with pool.acquire() as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('failed')")
+                raise RuntimeError("test")
+        except RuntimeError:
+            pass
+        assert count_items(pool) == 0
+
+        conn = pool.checkout()
+        conn.execute("INSERT INTO items (name) VALUES ('checkout')")
+        conn.close()
+        assert count_items(pool) == 0
+
+        pool.close_all()
+
+def test_pool_size_limit():
+    """max_size を超えて返却された接続は切断される"""
+    print("\n=== プール上限テスト ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        pool = create_pool(directory, max_size=1)
+
+        first = pool.checkout()
+        second = pool.checkout()
+        first.close()
+        second.close()
+
+        assert pool._idle_connections == [first]
+        try:
+            second.execute("SELECT 1")
+            closed = False
+        except sqlite3.ProgrammingError:
+            closed = True
+        assert closed, "プール上限を超えた接続が切断されていない"
+
+        pool.close_all()
+        assert pool._idle_connections == []
+
+def test_insert_trades_batch():
+    """一括挿入は入力順のIDを返し、読み取りキャッシュの破棄は1回だけ行う"""
+    print("\n=== 取引一括挿入テスト ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        manager = DatabaseManager(os.path.join(directory, 'trades_test.db'))
+        try:
+            assert manager.get_active_trades() == []
+
+            trades = [
+                ('USDJPY', 'buy', 150.0, 0.1, 149.5, 151.0, '2024-01-01T00:00:00'),
+                ('EURUSD', 'sell', 1.1, 0.2, 1.11, 1.09, '2024-01-01T01:00:00'),
+                ('GBPUSD', 'buy', 1.3, 0.3, None, None, None),
+            ]
+            with mock.patch.object(manager, 'invalidate_trades_cache', wraps=manager.invalidate_trades_cache) as invalidate:
+                trade_ids = manager.insert_trades_batch(trades)
+            assert invalidate.call_count == 1
+
+            assert trade_ids == sorted(trade_ids) and len(set(trade_ids)) == len(trades)
+            for trade_id, trade in zip(trade_ids, trades):
+                row = manager.get_trade_by_id(trade_id)
+                assert (row['symbol'], row['side'], row['quantity']) == (trade[0], trade[1], trade[3])
+            assert manager.get_trade_by_id(trade_ids[2])['entry_time'] is not None
+
+            # キャッシュが破棄されているため挿入した取引が返る
+            assert len(manager.get_active_trades()) == len(trades)
+            assert manager.insert_trades_batch([]) == []
+        finally:
+            manager.close()
+
+def test_transaction_rolls_back_on_exception():
+    """transaction() は正常終了時にコミットし、例外時はすべての書き込みをロールバックする"""
+    print("\n=== トランザクションテスト ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        manager = DatabaseManager(os.path.join(directory, 'transaction_test.db'))
+        trade = ('USDJPY', 'buy', 150.0, 0.1, 149.5, 151.0, '2024-01-01T00:00:00')
+        try:
+            try:
+                with manager.transaction() as conn:
+                    conn.execute(INSERT_TRADE_SQL, trade)
+                    conn.execute(INSERT_TRADE_SQL, trade)
+                    raise RuntimeError("test")
+            except RuntimeError:
+                pass
+            assert manager.get_trades_by_status('open') == []
+
+            with manager.transaction() as conn:
+                conn.execute(INSERT_TRADE_SQL, trade)
+                conn.execute(INSERT_TRADE_SQL, trade)
+            assert len(manager.get_trades_by_status('open')) == 2
+        finally:
+            manager.close()
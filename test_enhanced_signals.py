@@ -5,7 +5,6 @@
 
 import sys
 import os
-import asyncio
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -163,15 +162,10 @@ def test_integration():
         'swing_entry_threshold': 60
     }
     
-    async def test_signal():
-        signal = await engine._generate_swing_signal(data, parameters)
-        print(f"Backtest signal: {signal['action']} with score {signal['score']}")
-        if 'analysis' in signal and 'score_breakdown' in signal['analysis']:
-            print(f"Score breakdown: {signal['analysis']['score_breakdown']}")
-        return signal
-    
-    # 非同期実行
-    signal = asyncio.run(test_signal())
+    signal = engine._generate_swing_signal(data, parameters)
+    print(f"Backtest signal: {signal['action']} with score {signal['score']}")
+    if 'analysis' in signal and 'score_breakdown' in signal['analysis']:
+        print(f"Score breakdown: {signal['analysis']['score_breakdown']}")
     
     print("\n=== テスト完了 ===")
     return signal